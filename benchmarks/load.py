@@ -0,0 +1,202 @@
+"""End-to-end load benchmark for the FastAPI application.
+
+Starts the mock Coffee API and the application (via uvicorn) in separate processes, drives the configured endpoints
+with a fixed number of requests at a fixed concurrency and reports throughput and latency percentiles per endpoint.
+
+    python -m benchmarks.load --requests 2000 --concurrency 32 --latency-ms 10 --baseline benchmarks/baselines/load.json
+"""
+
+import asyncio
+import contextlib
+import os
+import pathlib
+import socket
+import subprocess
+import sys
+import time
+import typing as t
+
+import aiohttp
+from pydantic import BaseModel, Field
+
+from benchmarks.report import Direction, Metric, Report, find_regressions, percentile
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parent.parent
+DEFAULT_ENDPOINTS = ["/", "/health", "/api/v1/coffee/recommend"]
+
+
+class LoadConfig(BaseModel):
+    requests: int = Field(default=1000, ge=1, description="Measured requests per endpoint")
+    warmup: int = Field(default=50, ge=0, description="Unmeasured requests per endpoint sent before measuring")
+    concurrency: int = Field(default=16, ge=1, description="Number of in-flight requests")
+    workers: int = Field(default=1, ge=1, description="Number of uvicorn worker processes")
+    endpoints: list[str] = Field(default_factory=lambda: list(DEFAULT_ENDPOINTS))
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def spawn(args: list[str], env: dict[str, str] | None = None) -> t.Iterator[subprocess.Popen[bytes]]:
+    process = subprocess.Popen(args, cwd=ROOT_DIR, env={**os.environ, **(env or {})})
+    try:
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def wait_until_ready(
+    session: aiohttp.ClientSession, url: str, timeout: float = 30.0, interval: float = 0.1
+) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with session.get(url) as response:
+                await response.read()
+                return
+        except aiohttp.ClientError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{url} did not become ready within {timeout}s") from None
+            await asyncio.sleep(interval)
+
+
+async def drive(session: aiohttp.ClientSession, url: str, requests: int, concurrency: int) -> dict[str, Metric]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                    failed = response.status >= 400
+            except aiohttp.ClientError:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "rps": Metric(value=requests / elapsed, unit="req/s", direction=Direction.HIGHER_IS_BETTER),
+        "p50": Metric(value=percentile(latencies, 50), unit="ms", direction=Direction.LOWER_IS_BETTER),
+        "p95": Metric(value=percentile(latencies, 95), unit="ms", direction=Direction.LOWER_IS_BETTER),
+        "p99": Metric(value=percentile(latencies, 99), unit="ms", direction=Direction.LOWER_IS_BETTER),
+        "error_rate": Metric(value=errors / requests, unit="ratio", direction=Direction.LOWER_IS_BETTER),
+    }
+
+
+async def run(config: LoadConfig, mock_args: list[str]) -> Report:
+    mock_port, app_port = free_port(), free_port()
+    mock_url = f"http://127.0.0.1:{mock_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+
+    app_env = {
+        "HOST": "127.0.0.1",
+        "PORT": str(app_port),
+        "COFFEE_API__HOST": mock_url,
+        "LOGGING__LEVEL": "WARNING",
+    }
+    mock_cmd = [sys.executable, "-m", "benchmarks.mock_coffee_api", "--port", str(mock_port), *mock_args]
+    app_cmd = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "python_service_template.app:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(app_port),
+        "--workers",
+        str(config.workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+
+    report = Report(name="load", parameters={**config.model_dump(exclude={"endpoints"}), "mock": " ".join(mock_args)})
+    connector = aiohttp.TCPConnector(limit=config.concurrency)
+    with spawn(mock_cmd), spawn(app_cmd, env=app_env):
+        async with aiohttp.ClientSession(connector=connector) as session:
+            await wait_until_ready(session, f"{mock_url}/hot")
+            await wait_until_ready(session, f"{app_url}/openapi.json")
+            for endpoint in config.endpoints:
+                url = f"{app_url}{endpoint}"
+                if config.warmup:
+                    await drive(session, url, config.warmup, config.concurrency)
+                report.results[endpoint] = await drive(session, url, config.requests, config.concurrency)
+    return report
+
+
+def print_report(report: Report) -> None:
+    print(f"{'endpoint':<32} {'rps':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for endpoint, metrics in report.results.items():
+        print(
+            f"{endpoint:<32} {metrics['rps'].value:>10.1f} {metrics['p50'].value:>10.2f} "
+            f"{metrics['p95'].value:>10.2f} {metrics['p99'].value:>10.2f} {metrics['error_rate'].value:>8.2%}"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the end-to-end load benchmark.")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--endpoint", action="append", dest="endpoints", help="Endpoint to drive (repeatable)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mock Coffee API base latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Mock Coffee API latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Mock Coffee API error rate")
+    parser.add_argument("--catalog-size", type=int, default=20, help="Mock Coffee API drinks per category")
+    parser.add_argument("--description-size", type=int, default=200, help="Mock Coffee API description length")
+    parser.add_argument("--etag", action="store_true", help="Mock Coffee API sends ETags and answers with 304")
+    parser.add_argument("--output", type=pathlib.Path, default=ROOT_DIR / "benchmarks" / "results" / "load.json")
+    parser.add_argument("--baseline", type=pathlib.Path, help="Report to compare against")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="Allowed regression in percent")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args()
+
+    load_config = LoadConfig(
+        requests=args.requests,
+        warmup=args.warmup,
+        concurrency=args.concurrency,
+        workers=args.workers,
+        endpoints=args.endpoints or DEFAULT_ENDPOINTS,
+    )
+    mock_options = [
+        f"--latency-ms={args.latency_ms}",
+        f"--jitter-ms={args.jitter_ms}",
+        f"--error-rate={args.error_rate}",
+        f"--catalog-size={args.catalog_size}",
+        f"--description-size={args.description_size}",
+        *(["--etag"] if args.etag else []),
+    ]
+
+    result = asyncio.run(run(load_config, mock_options))
+    print_report(result)
+    result.save(args.output)
+    print(f"Report written to {args.output}")
+
+    if args.baseline and args.save_baseline:
+        result.save(args.baseline)
+        print(f"Baseline written to {args.baseline}")
+    elif args.baseline:
+        regressions = find_regressions(Report.load(args.baseline), result, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
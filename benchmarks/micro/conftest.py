@@ -0,0 +1,40 @@
+import asyncio
+import logging
+import os
+import typing as t
+
+import pytest
+import structlog
+
+from benchmarks.mock_coffee_api import MockApiConfig, generate_catalog
+from python_service_template.settings import LoggingConfig, LoggingLevel, configure_structlog
+
+CATALOG_SIZES = [10, 100, 1000]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def structlog_to_devnull() -> t.Iterator[None]:
+    """Use the application's logging setup, but discard the output so it does not skew the measurements."""
+    configure_structlog("bench", "bench", LoggingConfig(level=LoggingLevel.INFO, format="JSON"))
+    with open(os.devnull, "w") as devnull:
+        for handler in logging.getLogger().handlers:
+            t.cast(logging.StreamHandler, handler).setStream(devnull)
+        yield
+    structlog.reset_defaults()
+
+
+@pytest.fixture(params=CATALOG_SIZES, ids=lambda size: f"drinks={size}")
+def catalog_payload(request: pytest.FixtureRequest) -> list[dict[str, t.Any]]:
+    return generate_catalog("hot", MockApiConfig(catalog_size=request.param))
+
+
+@pytest.fixture
+def run_async() -> t.Iterator[t.Callable[[t.Callable[[], t.Awaitable[t.Any]]], t.Any]]:
+    """Run a coroutine factory to completion on a dedicated event loop, once per benchmark round."""
+    loop = asyncio.new_event_loop()
+
+    def run(factory: t.Callable[[], t.Awaitable[t.Any]]) -> t.Any:
+        return loop.run_until_complete(factory())
+
+    yield run
+    loop.close()
@@ -0,0 +1,19 @@
+import typing as t
+
+import pytest
+
+from benchmarks.mock_coffee_api import MockApiConfig, generate_catalog
+from python_service_template.infrastructure.client.coffee import CoffeeDrinkDTO, CoffeeDrinksDTO
+
+
+@pytest.mark.benchmark(group="coffee-client")
+def test_model_validate(benchmark, catalog_payload: list[dict[str, t.Any]]) -> None:
+    drinks = benchmark(CoffeeDrinksDTO.model_validate, catalog_payload)
+    assert len(drinks.root) == len(catalog_payload)
+
+
+@pytest.mark.benchmark(group="coffee-client")
+def test_to_domain(benchmark) -> None:
+    dto = CoffeeDrinkDTO.model_validate(generate_catalog("hot", MockApiConfig(catalog_size=1))[0])
+    drink = benchmark(dto.to_domain)
+    assert drink.id == dto.id
@@ -0,0 +1,46 @@
+import typing as t
+
+import pytest
+
+from python_service_template.domain.coffee.entity import CoffeeDrink
+from python_service_template.domain.coffee.repository import CoffeeClient
+from python_service_template.domain.coffee.service import SimpleCoffeeService
+from python_service_template.infrastructure.client.coffee import CoffeeDrinksDTO
+
+
+class StubCoffeeClient(CoffeeClient):
+    def __init__(self, drinks: list[CoffeeDrink]) -> None:
+        self.drinks = drinks
+
+    async def healthy(self) -> bool:
+        return True
+
+    async def get_all(self) -> list[CoffeeDrink]:
+        return self.drinks
+
+    async def get_hot(self) -> list[CoffeeDrink]:
+        return self.drinks
+
+    async def get_iced(self) -> list[CoffeeDrink]:
+        return self.drinks
+
+
+@pytest.mark.benchmark(group="coffee-service")
+def test_recommend(benchmark, run_async, catalog_payload: list[dict[str, t.Any]]) -> None:
+    drinks = [dto.to_domain() for dto in CoffeeDrinksDTO.model_validate(catalog_payload).root]
+    # Move the espresso to the end so the service has to scan the whole catalog
+    drinks.append(drinks.pop(0))
+    service = SimpleCoffeeService(StubCoffeeClient(drinks))
+    recommendation = benchmark(run_async, service.recommend)
+    assert recommendation is not None
+    assert recommendation.title == "Espresso"
+
+
+@pytest.mark.benchmark(group="coffee-service")
+def test_get_drinks(benchmark, run_async, catalog_payload: list[dict[str, t.Any]]) -> None:
+    drinks = [dto.to_domain() for dto in CoffeeDrinksDTO.model_validate(catalog_payload).root]
+    # The stub returns the same list objects on every call, so the catalog index is built once and reused
+    service = SimpleCoffeeService(StubCoffeeClient(drinks))
+    ids = [drink.id for drink in drinks[-50:]] + [-1]
+    lookup = benchmark(run_async, lambda: service.get_drinks(ids))
+    assert lookup.not_found == [-1]
@@ -0,0 +1,25 @@
+import json
+import typing as t
+
+import pytest
+
+from python_service_template.compression import PrecompressedCache, available_encoders
+
+ENCODINGS = list(available_encoders())
+
+
+@pytest.mark.benchmark(group="compression")
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_compress(benchmark, catalog_payload: list[dict[str, t.Any]], encoding: str) -> None:
+    content = json.dumps(catalog_payload).encode()
+    compressed = benchmark(available_encoders()[encoding].compress, content)
+    assert len(compressed) < len(content)
+
+
+@pytest.mark.benchmark(group="compression")
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_precompressed_cache_hit(benchmark, catalog_payload: list[dict[str, t.Any]], encoding: str) -> None:
+    content = json.dumps(catalog_payload).encode()
+    cache = PrecompressedCache()
+    cache.get("version", encoding, content)
+    benchmark(cache.get, "version", encoding, content)
@@ -0,0 +1,57 @@
+import contextlib
+import typing as t
+
+import pytest
+from fastapi.dependencies.utils import solve_dependencies
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+
+from python_service_template.app import app
+from python_service_template.container import Container
+from python_service_template.dependencies import settings
+from python_service_template.domain.coffee.service import SimpleCoffeeService
+from python_service_template.infrastructure.client.coffee import AsyncCoffeeClient
+from python_service_template.infrastructure.health import DetailedHealthChecker, SimpleHealthChecker
+
+
+@pytest.fixture
+def container(run_async) -> t.Iterator[Container]:
+    manager = Container.create(settings())
+    app.state.container = run_async(manager.__aenter__)
+    yield app.state.container
+    run_async(lambda: manager.__aexit__(None, None, None))
+    del app.state.container
+
+
+@pytest.mark.benchmark(group="dependencies")
+@pytest.mark.parametrize("path", ["/", "/health", "/api/v1/coffee/recommend"])
+def test_solve_route_dependencies(benchmark, run_async, container: Container, path: str) -> None:
+    route = next(route for route in app.routes if isinstance(route, APIRoute) and route.path == path)
+    request = Request({"type": "http", "app": app, "method": "GET", "path": path, "headers": [], "query_string": b""})
+
+    async def solve() -> t.Any:
+        async with contextlib.AsyncExitStack() as stack:
+            return await solve_dependencies(
+                request=request,
+                dependant=route.dependant,
+                dependency_overrides_provider=app,
+                async_exit_stack=stack,
+                embed_body_fields=False,
+            )
+
+    solved = benchmark(run_async, solve)
+    assert not solved.errors
+
+
+@pytest.mark.benchmark(group="dependencies")
+def test_per_request_object_graph(benchmark) -> None:
+    """Reference: cost of building the object graph on every request, as the dependencies used to."""
+    app_settings = settings()
+
+    def build() -> None:
+        client = AsyncCoffeeClient(base_url=app_settings.coffee_api.host)
+        SimpleCoffeeService(client=client)
+        DetailedHealthChecker(client, app_settings.app_version, app_settings.git_commit_sha)
+        SimpleHealthChecker(client, app_settings.app_version, app_settings.git_commit_sha)
+
+    benchmark(build)
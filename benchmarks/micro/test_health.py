@@ -0,0 +1,16 @@
+import pytest
+
+from python_service_template.api.health import DetailedHealthResponse
+from python_service_template.infrastructure.health import DetailedHealthStatus, HealthIndicator
+
+
+@pytest.mark.benchmark(group="health")
+def test_detailed_health_response_from_domain(benchmark) -> None:
+    status = DetailedHealthStatus(
+        git_commit_sha="sha",
+        heartbeat=HealthIndicator.HEALTHY,
+        version="0.1.0",
+        checks={"coffee": HealthIndicator.HEALTHY},
+    )
+    response = benchmark(DetailedHealthResponse.from_domain, status)
+    assert response.checks == status.checks
@@ -0,0 +1,14 @@
+import pytest
+import structlog
+
+
+@pytest.mark.benchmark(group="logging")
+def test_processor_chain_emitted(benchmark) -> None:
+    log = structlog.get_logger("bench").bind(class_name="Bench")
+    benchmark(log.info, "Benchmark event", drink_id=1)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_processor_chain_filtered(benchmark) -> None:
+    log = structlog.get_logger("bench").bind(class_name="Bench")
+    benchmark(log.debug, "Benchmark event", drink_id=1)
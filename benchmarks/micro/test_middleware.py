@@ -0,0 +1,101 @@
+import typing as t
+import uuid
+
+import pytest
+from asgi_correlation_id import CorrelationIdMiddleware
+from prometheus_client import CollectorRegistry
+from prometheus_fastapi_instrumentator import Instrumentator
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.types import Message
+
+from python_service_template.compression import CompressionMiddleware
+from python_service_template.middleware import RequestContextMiddleware, SequentialId
+from python_service_template.tracing import Tracer
+
+ORIGINS = ["http://localhost:3000", "http://localhost:5173"]
+
+CORS = Middleware(
+    CORSMiddleware,
+    allow_origins=ORIGINS,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
+)
+CORRELATION_ID = Middleware(
+    CorrelationIdMiddleware,
+    header_name="X-Request-ID",
+    update_request_header=True,
+    generator=lambda: uuid.uuid4().hex,
+    validator=None,
+)
+REQUEST_CONTEXT = Middleware(
+    RequestContextMiddleware, allow_origins=ORIGINS, allow_credentials=True, expose_headers=["X-Request-ID"]
+)
+
+# Each stack is compared against "none", the difference is the per-request cost of its middleware
+STACKS: dict[str, list[Middleware]] = {
+    "none": [],
+    "cors": [CORS],
+    "correlation-id": [CORRELATION_ID],
+    "cors+correlation-id": [CORRELATION_ID, CORS],
+    "request-context": [REQUEST_CONTEXT],
+    "request-context-sequential-id": [
+        Middleware(RequestContextMiddleware, generator=SequentialId(), allow_origins=ORIGINS, allow_credentials=True)
+    ],
+    "request-context-traced": [
+        Middleware(RequestContextMiddleware, allow_origins=ORIGINS, tracer=Tracer(sample_rate=1.0, buffer_size=0))
+    ],
+    "compression": [Middleware(CompressionMiddleware)],
+    "instrumentator": [],
+}
+
+
+async def index(_request: Request) -> PlainTextResponse:
+    return PlainTextResponse("OK")
+
+
+def create_app(stack: str) -> Starlette:
+    app = Starlette(routes=[Route("/", index)], middleware=STACKS[stack])
+    if stack == "instrumentator":
+        Instrumentator(registry=CollectorRegistry()).instrument(app)
+    return app
+
+
+@pytest.mark.benchmark(group="middleware")
+@pytest.mark.parametrize("stack", list(STACKS))
+def test_middleware_overhead(benchmark, run_async, stack: str) -> None:
+    app = create_app(stack)
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    async def request() -> t.Any:
+        messages.clear()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/",
+            "raw_path": b"/",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"localhost"), (b"origin", b"http://localhost:3000"), (b"accept", b"*/*")],
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 3000),
+        }
+        await app(scope, receive, send)
+
+    benchmark(run_async, request)
+    assert messages[0]["status"] == 200
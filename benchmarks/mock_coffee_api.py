@@ -0,0 +1,106 @@
+"""Local stand-in for the upstream Coffee API used by the benchmark suite.
+
+Run it standalone with:
+
+    python -m benchmarks.mock_coffee_api --port 8081 --latency-ms 20 --jitter-ms 5
+"""
+
+import asyncio
+import hashlib
+import random
+import typing as t
+
+from aiohttp import web
+from pydantic import BaseModel, Field
+
+
+class MockApiConfig(BaseModel):
+    latency_ms: float = Field(default=0.0, ge=0, description="Base latency added to every response")
+    jitter_ms: float = Field(default=0.0, ge=0, description="Uniform random jitter added on top of the latency")
+    error_rate: float = Field(default=0.0, ge=0, le=1, description="Fraction of requests answered with HTTP 500")
+    catalog_size: int = Field(default=20, ge=1, description="Number of drinks served per category")
+    description_size: int = Field(default=200, ge=0, description="Length of each drink description in characters")
+    seed: int = Field(default=0, description="Seed for payload generation and error/jitter sampling")
+    etag: bool = Field(default=False, description="Send an ETag and answer matching If-None-Match with 304")
+
+
+def generate_catalog(category: str, config: MockApiConfig) -> list[dict[str, t.Any]]:
+    """Build a deterministic catalog that mirrors the shape of the real upstream payload."""
+    rng = random.Random(f"{config.seed}-{category}")
+    drinks: list[dict[str, t.Any]] = []
+    for idx in range(1, config.catalog_size + 1):
+        # The first hot drink is always an espresso so /recommend has something to return
+        title = "Espresso" if category == "hot" and idx == 1 else f"{category.title()} Drink {idx}"
+        drinks.append(
+            {
+                "id": idx,
+                "title": title,
+                "description": "".join(rng.choices("abcdefghijklmnopqrstuvwxyz ", k=config.description_size)),
+                "image": f"https://example.com/{category}/{idx}.jpg",
+                # Upstream mixes both representations, so exercise both validator paths
+                "ingredients": ["coffee", "water"] if idx % 2 else "coffee, milk, sugar",
+            }
+        )
+    return drinks
+
+
+def create_mock_app(config: MockApiConfig) -> web.Application:
+    rng = random.Random(config.seed)
+    # Payloads are serialized once so the mock itself does not dominate the measurements
+    payloads = {
+        category: t.cast(bytes, web.json_response(generate_catalog(category, config)).body)
+        for category in ("hot", "iced")
+    }
+    etags = {category: f'"{hashlib.sha256(payload).hexdigest()[:16]}"' for category, payload in payloads.items()}
+
+    async def delay() -> None:
+        latency = config.latency_ms + rng.uniform(0, config.jitter_ms)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    def make_handler(category: str) -> t.Callable[[web.Request], t.Awaitable[web.Response]]:
+        async def handler(request: web.Request) -> web.Response:
+            await delay()
+            if rng.random() < config.error_rate:
+                raise web.HTTPInternalServerError()
+            if not config.etag:
+                return web.Response(body=payloads[category], content_type="application/json")
+            if request.headers.get("If-None-Match") == etags[category]:
+                return web.Response(status=304, headers={"ETag": etags[category]})
+            return web.Response(
+                body=payloads[category], content_type="application/json", headers={"ETag": etags[category]}
+            )
+
+        return handler
+
+    app = web.Application()
+    app.router.add_get("/hot", make_handler("hot"))
+    app.router.add_get("/iced", make_handler("iced"))
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Coffee API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--catalog-size", type=int, default=20)
+    parser.add_argument("--description-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--etag", action="store_true", help="Send ETags and answer revalidations with 304")
+    args = parser.parse_args()
+
+    mock_config = MockApiConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        catalog_size=args.catalog_size,
+        description_size=args.description_size,
+        seed=args.seed,
+        etag=args.etag,
+    )
+    web.run_app(create_mock_app(mock_config), host=args.host, port=args.port, print=None)
@@ -0,0 +1,86 @@
+"""Machine-readable benchmark reports and regression checks against a stored baseline."""
+
+import enum
+import math
+import pathlib
+import platform
+import sys
+
+from pydantic import BaseModel, Field
+
+
+class Direction(str, enum.Enum):
+    HIGHER_IS_BETTER = "HIGHER_IS_BETTER"
+    LOWER_IS_BETTER = "LOWER_IS_BETTER"
+
+
+class Metric(BaseModel):
+    value: float
+    unit: str
+    direction: Direction
+
+
+class Report(BaseModel):
+    name: str
+    python: str = Field(default_factory=platform.python_version)
+    platform: str = Field(default_factory=lambda: sys.platform)
+    parameters: dict[str, str | int | float] = Field(default_factory=dict)
+    # Metrics are grouped per scenario (e.g. an endpoint), then keyed by metric name
+    results: dict[str, dict[str, Metric]] = Field(default_factory=dict)
+    # Informational numbers (e.g. a cost breakdown) that are reported but never compared against a baseline
+    breakdown: dict[str, dict[str, float]] = Field(default_factory=dict)
+
+    def save(self, path: pathlib.Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.model_dump_json(indent=2) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "Report":
+        return cls.model_validate_json(path.read_text(encoding="utf-8"))
+
+
+class Regression(BaseModel):
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+    change_pct: float
+
+    def __str__(self) -> str:
+        return f"{self.scenario} {self.metric}: {self.baseline:.3f} -> {self.current:.3f} ({self.change_pct:+.1f}%)"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile; ``samples`` does not need to be sorted."""
+    if not samples:
+        return math.nan
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def find_regressions(baseline: Report, current: Report, tolerance_pct: float) -> list[Regression]:
+    """Compare every metric present in both reports and return those worse than ``tolerance_pct``."""
+    regressions = []
+    for scenario, metrics in current.results.items():
+        for name, metric in metrics.items():
+            reference = baseline.results.get(scenario, {}).get(name)
+            if reference is None:
+                continue
+            if reference.value == 0:
+                # No relative change from zero, any increase of e.g. an error rate of 0 is a regression
+                change_pct = math.inf if metric.value > 0 else 0.0
+            else:
+                change_pct = (metric.value - reference.value) / reference.value * 100
+            worse = -change_pct if metric.direction == Direction.HIGHER_IS_BETTER else change_pct
+            if worse > tolerance_pct:
+                regressions.append(
+                    Regression(
+                        scenario=scenario,
+                        metric=name,
+                        baseline=reference.value,
+                        current=metric.value,
+                        change_pct=change_pct,
+                    )
+                )
+    return regressions
@@ -0,0 +1,167 @@
+"""Startup benchmark: import time of the application and time to the first served request.
+
+The import time is measured with ``python -X importtime`` in a fresh interpreter and digested per top-level package.
+The time to first request is measured from spawning ``python -m python_service_template`` until ``/`` answers.
+
+    python -m benchmarks.startup --runs 5 --import-budget-ms 800 --first-request-budget-ms 3000
+"""
+
+import asyncio
+import pathlib
+import re
+import statistics
+import subprocess
+import sys
+import time
+import typing as t
+
+import aiohttp
+
+from benchmarks.load import ROOT_DIR, free_port, spawn, wait_until_ready
+from benchmarks.report import Direction, Metric, Report, find_regressions
+
+APP_MODULE = "python_service_template.app"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+class ImportRecord(t.NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str, target: str) -> list[ImportRecord]:
+    """Return the records caused by importing ``target``, i.e. the target line and everything it pulled in.
+
+    ``-X importtime`` prints modules after their dependencies, so these are the lines between the previous top-level
+    import (typically ``site``) and the line of the target itself.
+    """
+    records: list[ImportRecord] = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        record = ImportRecord(module, int(self_us), int(cumulative_us), len(indent) // 2)
+        if record.depth == 0 and record.module != target:
+            records.clear()
+            continue
+        records.append(record)
+        if record.depth == 0:
+            return records
+    raise ValueError(f"{target} not found in -X importtime output")
+
+
+def measure_import(module: str) -> list[ImportRecord]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr, module)
+
+
+def digest(records: list[ImportRecord], top: int) -> dict[str, dict[str, float]]:
+    """Group self time by top-level package and list the slowest individual modules, both in milliseconds."""
+    by_package: dict[str, float] = {}
+    for record in records:
+        package = record.module.split(".", 1)[0]
+        by_package[package] = by_package.get(package, 0.0) + record.self_us / 1000
+    slowest = sorted(records, key=lambda record: record.self_us, reverse=True)[:top]
+    return {
+        "import_by_package_ms": dict(sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]),
+        "import_slowest_modules_ms": {record.module: record.self_us / 1000 for record in slowest},
+    }
+
+
+async def measure_first_request(workers: int, path: str) -> float:
+    mock_port, app_port = free_port(), free_port()
+    mock_url = f"http://127.0.0.1:{mock_port}"
+    app_env = {
+        "HOST": "127.0.0.1",
+        "PORT": str(app_port),
+        "WORKERS": str(workers),
+        "COFFEE_API__HOST": mock_url,
+        "LOGGING__LEVEL": "WARNING",
+    }
+    async with aiohttp.ClientSession() as session:
+        with spawn([sys.executable, "-m", "benchmarks.mock_coffee_api", "--port", str(mock_port)]):
+            await wait_until_ready(session, f"{mock_url}/hot")
+            start = time.perf_counter()
+            with spawn([sys.executable, "-m", "python_service_template"], env=app_env):
+                await wait_until_ready(session, f"http://127.0.0.1:{app_port}{path}", interval=0.01)
+                return (time.perf_counter() - start) * 1000
+
+
+def run(runs: int, workers: int, path: str, top: int) -> Report:
+    imports = [measure_import(APP_MODULE) for _ in range(runs)]
+    # Digest the run with the median total so the breakdown is representative of the reported number
+    imports.sort(key=lambda records: records[-1].cumulative_us)
+    median_import = imports[len(imports) // 2]
+    first_requests = [asyncio.run(measure_first_request(workers, path)) for _ in range(runs)]
+
+    report = Report(name="startup", parameters={"runs": runs, "workers": workers, "path": path})
+    report.results["startup"] = {
+        "import_ms": Metric(
+            value=median_import[-1].cumulative_us / 1000, unit="ms", direction=Direction.LOWER_IS_BETTER
+        ),
+        "first_request_ms": Metric(
+            value=statistics.median(first_requests), unit="ms", direction=Direction.LOWER_IS_BETTER
+        ),
+    }
+    report.breakdown = digest(median_import, top)
+    return report
+
+
+def print_report(report: Report) -> None:
+    for name, values in report.breakdown.items():
+        print(name)
+        for key, value in values.items():
+            print(f"  {key:<56} {value:>10.2f}")
+    for name, metric in report.results["startup"].items():
+        print(f"{name:<58} {metric.value:>10.2f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure application import time and time to first request.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of measurements, the median is reported")
+    parser.add_argument("--workers", type=int, default=1, help="Number of uvicorn worker processes")
+    parser.add_argument("--path", default="/", help="Endpoint polled for the first request")
+    parser.add_argument("--top", type=int, default=15, help="Number of packages and modules in the breakdown")
+    parser.add_argument("--import-budget-ms", type=float, help="Fail if the import time exceeds this budget")
+    parser.add_argument("--first-request-budget-ms", type=float, help="Fail if the first request takes longer")
+    parser.add_argument("--output", type=pathlib.Path, default=ROOT_DIR / "benchmarks" / "results" / "startup.json")
+    parser.add_argument("--baseline", type=pathlib.Path, help="Report to compare against")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="Allowed regression in percent")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args()
+
+    result = run(args.runs, args.workers, args.path, args.top)
+    print_report(result)
+    result.save(args.output)
+    print(f"Report written to {args.output}")
+
+    failures = []
+    budgets = {"import_ms": args.import_budget_ms, "first_request_ms": args.first_request_budget_ms}
+    for metric_name, budget in budgets.items():
+        measured = result.results["startup"][metric_name].value
+        if budget is not None and measured > budget:
+            failures.append(f"BUDGET {metric_name}: {measured:.1f}ms > {budget:.1f}ms")
+
+    if args.baseline and args.save_baseline:
+        result.save(args.baseline)
+        print(f"Baseline written to {args.baseline}")
+    elif args.baseline:
+        failures.extend(
+            f"REGRESSION {regression}"
+            for regression in find_regressions(Report.load(args.baseline), result, args.tolerance)
+        )
+
+    for failure in failures:
+        print(failure)
+    sys.exit(1 if failures else 0)
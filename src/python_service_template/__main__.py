@@ -0,0 +1,76 @@
+"""Run the service: ``python -m python_service_template [--reload]``.
+
+This module deliberately does not import the application. With ``--reload`` or several workers the supervising
+process only needs the settings, the application is imported by the worker processes that actually serve requests.
+"""
+
+import argparse
+import asyncio
+import os
+import pathlib
+import shutil
+import tempfile
+
+import uvicorn
+import uvloop
+
+from python_service_template.settings import Settings, create_std_logging_config
+
+
+def prepare_metrics_dir(workers: int) -> pathlib.Path | None:
+    """Point prometheus_client at a directory shared by all workers, see ``python_service_template.metrics``.
+
+    This has to happen before the workers import prometheus_client. An explicit ``PROMETHEUS_MULTIPROC_DIR`` is
+    honoured, otherwise a temporary directory is created when more than one worker runs. Returns the directory if it
+    was created here and should be removed on exit.
+    """
+    configured = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if configured:
+        path = pathlib.Path(configured)
+        path.mkdir(parents=True, exist_ok=True)
+        # Values left over from a previous run would otherwise be added to the new ones
+        for file in path.glob("*.db"):
+            file.unlink()
+        return None
+    if workers <= 1:
+        return None
+    path = pathlib.Path(tempfile.mkdtemp(prefix="prometheus-"))
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(path)
+    return path
+
+
+def main(app: str = "python_service_template.app:app") -> None:
+    parser = argparse.ArgumentParser(description="Run the FastAPI service.")
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        help="Enable auto-reload for development.",
+    )
+    args = parser.parse_args()
+
+    app_settings = Settings()
+
+    # Configure uvloop as the event loop policy
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+    workers = None if args.reload else app_settings.workers
+    temporary_metrics_dir = prepare_metrics_dir(workers or 1)
+    try:
+        uvicorn.run(
+            app,
+            host=app_settings.host,
+            port=app_settings.port,
+            log_config=create_std_logging_config(
+                app_settings.app_version, app_settings.git_commit_sha, app_settings.logging
+            ),
+            access_log=True,
+            reload=args.reload,
+            workers=workers,
+        )
+    finally:
+        if temporary_metrics_dir is not None:
+            shutil.rmtree(temporary_metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
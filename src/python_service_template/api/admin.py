@@ -0,0 +1,70 @@
+import datetime
+import typing as t
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel, ConfigDict, Field
+
+from python_service_template.dependencies import tracer
+from python_service_template.tracing import AttributeValue, Span, Trace, Tracer
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+)
+
+
+class SpanResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    span_id: str = Field(alias="spanId")
+    parent_span_id: str | None = Field(alias="parentSpanId")
+    name: str
+    start_offset_ms: float = Field(alias="startOffsetMs")
+    duration_ms: float = Field(alias="durationMs")
+    attributes: dict[str, AttributeValue]
+
+    @classmethod
+    def from_domain(cls, domain: Span, trace_start_ns: int) -> "SpanResponse":
+        return cls(
+            span_id=f"{domain.span_id:016x}",
+            parent_span_id=f"{domain.parent_id:016x}" if domain.parent_id is not None else None,
+            name=domain.name,
+            start_offset_ms=(domain.start_ns - trace_start_ns) / 1_000_000,
+            duration_ms=domain.duration_ms,
+            attributes=domain.attributes,
+        )
+
+
+class TraceResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    trace_id: str = Field(alias="traceId")
+    correlation_id: str = Field(alias="correlationId")
+    name: str
+    start_time: datetime.datetime = Field(alias="startTime")
+    duration_ms: float = Field(alias="durationMs")
+    response_ms: float = Field(alias="responseMs")
+    spans: list[SpanResponse]
+
+    @classmethod
+    def from_domain(cls, domain: Trace) -> "TraceResponse":
+        start_ns = domain.root.start_ns
+        return cls(
+            trace_id=domain.trace_id,
+            correlation_id=domain.correlation_id,
+            name=domain.root.name,
+            start_time=datetime.datetime.fromtimestamp(start_ns / 1_000_000_000, tz=datetime.UTC),
+            duration_ms=domain.duration_ms,
+            response_ms=domain.response_ms,
+            spans=[SpanResponse.from_domain(span, start_ns) for span in domain.spans],
+        )
+
+
+@router.get("/traces", response_model=list[TraceResponse], response_model_by_alias=True)
+async def get_slow_traces(
+    recorder: t.Annotated[Tracer, Depends(tracer)],
+    limit: t.Annotated[int, Query(ge=1, description="Maximum number of traces, most recent first")] = 20,
+) -> list[TraceResponse]:
+    """Recent traces slower than the configured threshold, collected by this worker process."""
+    traces = list(recorder.slow_traces)[-limit:]
+    return [TraceResponse.from_domain(trace) for trace in reversed(traces)]
@@ -0,0 +1,16 @@
+import typing as t
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from python_service_template.dependencies import metrics_exporter
+from python_service_template.metrics import MetricsExporter
+
+router = APIRouter(include_in_schema=False)
+
+
+@router.get("/metrics")
+async def get_metrics(
+    request: Request,
+    exporter: t.Annotated[MetricsExporter, Depends(metrics_exporter)],
+) -> Response:
+    return exporter.cache.response(request, await exporter.render(), media_type=exporter.media_type)
@@ -1,10 +1,22 @@
+import functools
 import typing as t
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 
-from python_service_template.dependencies import coffee_service
-from python_service_template.domain.coffee.entity import CoffeeDrink
+from python_service_template.compression import PrecompressedCache
+from python_service_template.dependencies import catalog_watcher, coffee_service, precompressed_cache, settings
+from python_service_template.domain.coffee.catalog import CatalogChange, CatalogDrink, CoffeeCatalog, DrinksLookup
+from python_service_template.domain.coffee.entity import CoffeeCategory, CoffeeDrink
 from python_service_template.domain.coffee.service import CoffeeService
+from python_service_template.infrastructure.catalog_watcher import CatalogWatcher
+from python_service_template.settings import Settings
+from python_service_template.tracing import span
+
+MAX_LOOKUP_IDS = 100
+SSE_RETRY_MS = 5000
+NDJSON_CHUNK_SIZE = 64 * 1024
 
 router = APIRouter(
     prefix="/api/v1/coffee",
@@ -12,11 +24,183 @@ router = APIRouter(
 )
 
 
+class CatalogResponse(BaseModel):
+    version: str
+    hot: list[CoffeeDrink]
+    iced: list[CoffeeDrink]
+
+    @classmethod
+    def from_domain(cls, domain: CoffeeCatalog) -> "CatalogResponse":
+        return cls(version=domain.version, hot=domain.hot, iced=domain.iced)
+
+
+class DrinksLookupRequest(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=MAX_LOOKUP_IDS)
+
+
+class CatalogDrinkResponse(CoffeeDrink):
+    category: CoffeeCategory
+
+    @classmethod
+    def from_domain(cls, domain: CatalogDrink) -> "CatalogDrinkResponse":
+        return cls(category=domain.category, **dict(domain.drink))
+
+
+class DrinksLookupResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    drinks: list[CatalogDrinkResponse]
+    not_found: list[int] = Field(alias="notFound")
+
+    @classmethod
+    def from_domain(cls, domain: DrinksLookup) -> "DrinksLookupResponse":
+        return cls(
+            drinks=[CatalogDrinkResponse.from_domain(drink) for drink in domain.drinks],
+            not_found=domain.not_found,
+        )
+
+
+class CatalogChangeEvent(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    version: str
+    recommendation: CoffeeDrink | None
+    recommendation_changed: bool = Field(alias="recommendationChanged")
+    added: dict[CoffeeCategory, list[int]]
+    removed: dict[CoffeeCategory, list[int]]
+
+    @classmethod
+    def from_domain(cls, domain: CatalogChange) -> "CatalogChangeEvent":
+        return cls(
+            version=domain.version,
+            recommendation=domain.recommendation,
+            recommendation_changed=domain.recommendation_changed,
+            added=domain.added,
+            removed=domain.removed,
+        )
+
+    def to_sse(self) -> bytes:
+        return f"event: catalog\nid: {self.version}\ndata: {self.model_dump_json(by_alias=True)}\n\n".encode()
+
+
+def parse_ids(values: list[str]) -> list[int]:
+    """Accept both repeated (``ids=1&ids=2``) and comma separated (``ids=1,2``) query parameters."""
+    try:
+        ids = [int(value) for raw in values for value in raw.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Drink ids must be integers.") from None
+    if not ids:
+        raise HTTPException(status_code=422, detail="At least one drink id is required.")
+    if len(ids) > MAX_LOOKUP_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_LOOKUP_IDS} drink ids can be requested at once.")
+    return ids
+
+
 @router.get("/recommend", response_model=CoffeeDrink)
 async def get_recommended_coffee(
     service: t.Annotated[CoffeeService, Depends(coffee_service)],
 ) -> CoffeeDrink:
-    recommendation = await service.recommend()
-    if recommendation is None:
-        raise HTTPException(status_code=404, detail="No recommendation available.")
-    return recommendation
+    with span("get_recommended_coffee"):
+        recommendation = await service.recommend()
+        if recommendation is None:
+            raise HTTPException(status_code=404, detail="No recommendation available.")
+        return recommendation
+
+
+@functools.lru_cache(maxsize=2)
+def catalog_payload(catalog: CoffeeCatalog) -> bytes:
+    # Catalogs are immutable and reused while upstream is unchanged, so each version is serialized once
+    return CatalogResponse.from_domain(catalog).model_dump_json().encode()
+
+
+@router.get("/catalog", response_model=CatalogResponse)
+async def get_catalog(
+    request: Request,
+    service: t.Annotated[CoffeeService, Depends(coffee_service)],
+    cache: t.Annotated[PrecompressedCache, Depends(precompressed_cache)],
+) -> Response:
+    catalog = await service.catalog()
+    return cache.response(request, catalog_payload(catalog), version=catalog.version)
+
+
+async def ndjson(drinks: t.AsyncIterator[CoffeeDrink], chunk_size: int = NDJSON_CHUNK_SIZE) -> t.AsyncIterator[bytes]:
+    """Serialize one drink at a time, sending the lines in chunks of about ``chunk_size`` bytes.
+
+    The response awaits every chunk being sent, so a slow client pauses serialization. Chunks rather than single lines
+    keep the number of sends, and compression flushes, independent of the catalog size.
+    """
+    buffer = bytearray()
+    async for drink in drinks:
+        buffer += drink.model_dump_json().encode()
+        buffer += b"\n"
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+@router.get(
+    "/drinks/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}, "description": "One JSON encoded drink per line"}},
+)
+async def export_drinks(
+    service: t.Annotated[CoffeeService, Depends(coffee_service)],
+    category: t.Annotated[
+        list[CoffeeCategory] | None, Query(description="Categories to export, all by default")
+    ] = None,
+) -> StreamingResponse:
+    drinks = await service.export(category or list(CoffeeCategory))
+    return StreamingResponse(ndjson(drinks), media_type="application/x-ndjson")
+
+
+@router.get("/drinks", response_model=DrinksLookupResponse)
+async def get_drinks(
+    ids: t.Annotated[list[str], Query(description="Drink ids, repeated or comma separated")],
+    service: t.Annotated[CoffeeService, Depends(coffee_service)],
+) -> DrinksLookupResponse:
+    lookup = await service.get_drinks(parse_ids(ids))
+    return DrinksLookupResponse.from_domain(lookup)
+
+
+@router.post("/drinks", response_model=DrinksLookupResponse)
+async def lookup_drinks(
+    body: DrinksLookupRequest,
+    service: t.Annotated[CoffeeService, Depends(coffee_service)],
+) -> DrinksLookupResponse:
+    lookup = await service.get_drinks(body.ids)
+    return DrinksLookupResponse.from_domain(lookup)
+
+
+async def catalog_events_stream(
+    watcher: CatalogWatcher, heartbeat_interval: float, last_event_id: str | None
+) -> t.AsyncIterator[bytes]:
+    yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+    # Subscribe right after the check, without awaiting in between, so no change is missed or delivered twice
+    latest = await watcher.ensure_latest()
+    with watcher.broadcaster.subscribe() as subscription:
+        # Bring (re)connecting clients up to date unless they already saw the latest version
+        if latest is not None and latest.version != last_event_id:
+            yield CatalogChangeEvent.from_domain(latest).to_sse()
+        while True:
+            change = await subscription.get(timeout=heartbeat_interval)
+            # Comment frames keep proxies from closing idle connections and are ignored by EventSource
+            yield b": heartbeat\n\n" if change is None else CatalogChangeEvent.from_domain(change).to_sse()
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "Server-Sent Events of catalog changes"}},
+)
+async def catalog_events(
+    watcher: t.Annotated[CatalogWatcher, Depends(catalog_watcher)],
+    app_settings: t.Annotated[Settings, Depends(settings)],
+    last_event_id: t.Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    return StreamingResponse(
+        catalog_events_stream(watcher, app_settings.catalog_events.heartbeat_interval, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,31 +1,44 @@
-import uuid
 from contextlib import asynccontextmanager
 
 import structlog
-from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI, status
-from fastapi.middleware.cors import CORSMiddleware
 from fastapi.requests import Request
 from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from python_service_template.api.health import router as health_router
+from python_service_template.api.metrics import router as metrics_router
 from python_service_template.api.v1.coffee import router as coffee_router
+from python_service_template.compression import CompressionMiddleware
+from python_service_template.container import Container
 from python_service_template.dependencies import settings
-from python_service_template.settings import configure_structlog, create_std_logging_config
+from python_service_template.metrics import cleanup_dead_workers, mark_worker_stopped, multiprocess_dir
+from python_service_template.middleware import RequestContextMiddleware, create_id_generator
+from python_service_template.settings import configure_structlog
+from python_service_template.tracing import get_tracer
 
 # Centralized settings initialization
 _app_settings = settings()
 
+SERVICE_NAME = "python-service-template"
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Configure structlog for each worker process
     configure_structlog(_app_settings.app_version, _app_settings.git_commit_sha, _app_settings.logging)
-    app.state.instrumentator.expose(app, include_in_schema=False)
+    get_tracer().configure(_app_settings.tracing, SERVICE_NAME, _app_settings.app_version)
     app.state.log = structlog.get_logger("app")
     await app.state.log.awarning("Starting application")
-    yield
+    metrics_dir = multiprocess_dir()
+    if metrics_dir is not None:
+        dead_workers = cleanup_dead_workers(metrics_dir)
+        await app.state.log.ainfo("Using multiprocess metrics", path=str(metrics_dir), dead_workers=dead_workers)
+    async with Container.create(_app_settings) as container:
+        app.state.container = container
+        yield
+    if metrics_dir is not None:
+        mark_worker_stopped(metrics_dir)
     await app.state.log.awarning("Shutting down application")
 
 
@@ -35,26 +48,27 @@ app = FastAPI(
     version=_app_settings.app_version,
     lifespan=lifespan,
 )
+app.add_middleware(CompressionMiddleware, minimum_size=_app_settings.compression.minimum_size)
 app.add_middleware(
-    CORSMiddleware,
+    RequestContextMiddleware,
+    header_name=_app_settings.correlation_id.header_name,
+    generator=create_id_generator(_app_settings.correlation_id.generator),
     allow_origins=[
         "http://localhost:3000",
         "http://localhost:5173",
     ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["X-Request-ID"],
-)
-app.add_middleware(
-    CorrelationIdMiddleware,
-    header_name="X-Request-ID",
-    update_request_header=True,
-    generator=lambda: uuid.uuid4().hex,
-    validator=None,
+    expose_headers=[_app_settings.correlation_id.header_name],
+    tracer=get_tracer(),
 )
 app.include_router(coffee_router)
 app.include_router(health_router)
+app.include_router(metrics_router)
+if _app_settings.tracing.expose_traces:
+    # Only imported when enabled, the admin API is not part of the regular import path
+    from python_service_template.api.admin import router as admin_router
+
+    app.include_router(admin_router)
 instrumentator = Instrumentator().instrument(app)
 app.state.instrumentator = instrumentator
 
@@ -69,32 +83,8 @@ async def global_exception_handler(_request: Request, _exc: Exception) -> JSONRe
 
 
 if __name__ == "__main__":
-    import argparse
-    import asyncio
-
-    import uvicorn
-    import uvloop
+    # Kept for backwards compatibility, prefer ``python -m python_service_template`` which does not import the
+    # application in the supervising process
+    from python_service_template.__main__ import main
 
-    parser = argparse.ArgumentParser(description="Run the FastAPI service.")
-    parser.add_argument(
-        "--reload",
-        action="store_true",
-        help="Enable auto-reload for development.",
-    )
-    args = parser.parse_args()
-
-    # Configure uvloop as the event loop policy
-    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
-
-    workers = None if args.reload else _app_settings.workers
-    uvicorn.run(
-        f"{__name__}:app",
-        host=_app_settings.host,
-        port=_app_settings.port,
-        log_config=create_std_logging_config(
-            _app_settings.app_version, _app_settings.git_commit_sha, _app_settings.logging
-        ),
-        access_log=True,
-        reload=args.reload,
-        workers=workers,
-    )
+    main(f"{__name__}:app")
@@ -0,0 +1,291 @@
+import abc
+import collections
+import gzip
+import hashlib
+import typing as t
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# brotli and zstandard are optional (``compression`` extra), gzip is always available
+try:
+    import brotli  # type: ignore[import-untyped, import-not-found, unused-ignore]
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class StreamCompressor(t.Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it, so it can be sent right away"""
+        ...
+
+    def finish(self) -> bytes:
+        """Return the remaining compressed data and end the stream"""
+        ...
+
+
+class Encoder(abc.ABC):
+    name: str
+
+    @abc.abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress a complete payload"""
+        pass
+
+    @abc.abstractmethod
+    def stream(self) -> StreamCompressor:
+        """Start compressing a payload that is sent in chunks"""
+        pass
+
+
+class _ZlibStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class GzipEncoder(Encoder):
+    name = "gzip"
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        # mtime=0 keeps the output deterministic for identical payloads
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def stream(self) -> StreamCompressor:
+        return _ZlibStream(self.level)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class BrotliEncoder(Encoder):
+    name = "br"
+
+    def __init__(self, quality: int = 5) -> None:
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self) -> StreamCompressor:
+        return _BrotliStream(self.quality)
+
+
+class _ZstdStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class ZstdEncoder(Encoder):
+    name = "zstd"
+
+    def __init__(self, level: int = 3) -> None:
+        self.level = level
+        self._compressor = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def stream(self) -> StreamCompressor:
+        return _ZstdStream(self.level)
+
+
+def available_encoders() -> dict[str, Encoder]:
+    """Supported encoders in order of server preference."""
+    encoders: list[Encoder] = []
+    if zstandard is not None:
+        encoders.append(ZstdEncoder())
+    if brotli is not None:
+        encoders.append(BrotliEncoder())
+    encoders.append(GzipEncoder())
+    return {encoder.name: encoder for encoder in encoders}
+
+
+def negotiate(accept_encoding: str, encodings: t.Iterable[str]) -> str | None:
+    """Pick the encoding with the highest ``q`` value, ties are broken by the order of ``encodings``."""
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        key, _, value = params.strip().partition("=")
+        if key.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def etag_matches(if_none_match: str, version: str) -> bool:
+    """Weak comparison (RFC 9110, section 8.8.3.2) of ``If-None-Match`` against the entity tag of ``version``."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = f'"{version}"'
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+def is_compressible(headers: Headers) -> bool:
+    return "content-encoding" not in headers and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Compress responses with the best encoding the client accepts.
+
+    Responses smaller than ``minimum_size``, of a non-textual type or already encoded (e.g. served from the
+    ``PrecompressedCache``) are passed through. Streamed responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, encoders: dict[str, Encoder] | None = None) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = encoders if encoders is not None else available_encoders()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encoders)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, self.encoders[encoding], self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoder: Encoder, minimum_size: int) -> None:
+        self._send = send
+        self._encoder = encoder
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._stream: StreamCompressor | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the start message back until we know whether the body gets compressed
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        if self._stream is not None:
+            await self._send_chunk(message)
+            return
+
+        start = t.cast(Message, self._start)
+        headers = MutableHeaders(raw=start["headers"])
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if not is_compressible(headers) or (not more_body and len(body) < self._minimum_size):
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self._encoder.name
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+            self._stream = self._encoder.stream()
+            await self._send(start)
+            await self._send_chunk(message)
+        else:
+            compressed = self._encoder.compress(body)
+            headers["Content-Length"] = str(len(compressed))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_chunk(self, message: Message) -> None:
+        stream = t.cast(StreamCompressor, self._stream)
+        body = stream.compress(message.get("body", b""))
+        if message.get("more_body", False):
+            if body:
+                await self._send({"type": "http.response.body", "body": body, "more_body": True})
+        else:
+            await self._send({"type": "http.response.body", "body": body + stream.finish()})
+
+
+class PrecompressedCache:
+    """Compressed variants of cacheable payloads, keyed by content version and encoding.
+
+    The version is a hash of the uncompressed payload unless the caller already knows one (e.g. the catalog version),
+    so an unchanged catalog is compressed once per encoding and served from memory afterwards. It doubles as a weak
+    ``ETag``, letting clients revalidate with ``If-None-Match``.
+    """
+
+    def __init__(
+        self, max_entries: int = 256, minimum_size: int = 500, encoders: dict[str, Encoder] | None = None
+    ) -> None:
+        self.max_entries = max_entries
+        self.minimum_size = minimum_size
+        self.encoders = encoders if encoders is not None else available_encoders()
+        self._entries: collections.OrderedDict[tuple[str, str], bytes] = collections.OrderedDict()
+
+    def get(self, version: str, encoding: str, content: bytes) -> bytes:
+        key = (version, encoding)
+        compressed = self._entries.get(key)
+        if compressed is not None:
+            self._entries.move_to_end(key)
+            return compressed
+        compressed = self.encoders[encoding].compress(content)
+        self._entries[key] = compressed
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return compressed
+
+    def response(
+        self, request: Request, content: bytes, media_type: str = "application/json", version: str | None = None
+    ) -> Response:
+        """Serve ``content``; a given ``version`` must change whenever the content does, it is used as cache key."""
+        if version is None:
+            version = hashlib.blake2b(content, digest_size=16).hexdigest()
+        headers = {"ETag": f'W/"{version}"', "Vary": "Accept-Encoding"}
+        if etag_matches(request.headers.get("if-none-match", ""), version):
+            return Response(status_code=304, headers=headers)
+
+        encoding = negotiate(request.headers.get("accept-encoding", ""), self.encoders)
+        if encoding is None or len(content) < self.minimum_size:
+            return Response(content, media_type=media_type, headers=headers)
+        headers["Content-Encoding"] = encoding
+        return Response(self.get(version, encoding, content), media_type=media_type, headers=headers)
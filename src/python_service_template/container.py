@@ -0,0 +1,59 @@
+import contextlib
+import typing as t
+
+from python_service_template.compression import PrecompressedCache
+from python_service_template.domain.coffee.catalog import CatalogChange
+from python_service_template.domain.coffee.service import SimpleCoffeeService
+from python_service_template.infrastructure.broadcast import Broadcaster
+from python_service_template.infrastructure.catalog_watcher import CatalogWatcher
+from python_service_template.infrastructure.client.coffee import AsyncCoffeeClient
+from python_service_template.infrastructure.health import DetailedHealthChecker, SimpleHealthChecker
+from python_service_template.metrics import MetricsExporter
+from python_service_template.settings import Settings
+from python_service_template.tracing import Tracer, get_tracer
+
+if t.TYPE_CHECKING:
+    import aiohttp
+
+
+class Container:
+    """Application-scoped object graph, built once per worker process in the application lifespan.
+
+    FastAPI dependencies only look the objects up, so nothing is constructed on the request path. Tests can replace
+    individual objects through ``app.dependency_overrides`` or swap the whole container on ``app.state.container``.
+    """
+
+    def __init__(self, settings: Settings, session: "aiohttp.ClientSession") -> None:
+        self.settings = settings
+        self.session = session
+        self.coffee_client = AsyncCoffeeClient(base_url=settings.coffee_api.host, session=session)
+        self.coffee_service = SimpleCoffeeService(
+            client=self.coffee_client, catalog_max_age=settings.coffee_api.catalog_max_age
+        )
+        self.detailed_health_checker = DetailedHealthChecker(
+            self.coffee_client, settings.app_version, settings.git_commit_sha
+        )
+        self.simple_health_checker = SimpleHealthChecker(
+            self.coffee_client, settings.app_version, settings.git_commit_sha
+        )
+        self.precompressed_cache = PrecompressedCache(
+            max_entries=settings.compression.cache_size, minimum_size=settings.compression.minimum_size
+        )
+        self.tracer: Tracer = get_tracer()
+        self.metrics_exporter = MetricsExporter.from_environment(ttl=settings.metrics.cache_ttl)
+        self.catalog_broadcaster = Broadcaster[CatalogChange](buffer_size=settings.catalog_events.buffer_size)
+        self.catalog_watcher = CatalogWatcher(
+            self.coffee_service, self.catalog_broadcaster, interval=settings.catalog_events.refresh_interval
+        )
+
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def create(cls, settings: Settings) -> t.AsyncIterator["Container"]:
+        # Deferred so importing the application does not pay for aiohttp, see AsyncCoffeeClient
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=settings.coffee_api.pool_size)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            container = cls(settings, session)
+            async with container.catalog_watcher.running():
+                yield container
@@ -1,16 +1,20 @@
 import typing as t
 from functools import lru_cache
 
-from fastapi import Depends
+from fastapi import Depends, Request
 
+from python_service_template.compression import PrecompressedCache
+from python_service_template.container import Container
 from python_service_template.domain.coffee.repository import CoffeeClient
-from python_service_template.domain.coffee.service import CoffeeService, SimpleCoffeeService
-from python_service_template.infrastructure.client.coffee import AsyncCoffeeClient
+from python_service_template.domain.coffee.service import CoffeeService
+from python_service_template.infrastructure.catalog_watcher import CatalogWatcher
 from python_service_template.infrastructure.health import (
     DetailedHealthChecker,
     SimpleHealthChecker,
 )
+from python_service_template.metrics import MetricsExporter
 from python_service_template.settings import Settings
+from python_service_template.tracing import Tracer
 
 
 @lru_cache
@@ -18,25 +22,41 @@ def settings() -> Settings:
     return Settings()
 
 
-def coffee_client(settings: t.Annotated[Settings, Depends(settings)]) -> CoffeeClient:
-    return AsyncCoffeeClient(base_url=settings.coffee_api.host)
+# The dependencies below are ``async`` so FastAPI resolves them inline instead of dispatching each one to its
+# threadpool, and they only return objects owned by the container created in the application lifespan.
 
 
-def coffee_service(
-    client: t.Annotated[CoffeeClient, Depends(coffee_client)],
-) -> CoffeeService:
-    return SimpleCoffeeService(client=client)
+async def container(request: Request) -> Container:
+    return request.app.state.container
 
 
-def detailed_health_checker(
-    coffee_client: t.Annotated[CoffeeClient, Depends(coffee_client)],
-    settings: t.Annotated[Settings, Depends(settings)],
-) -> DetailedHealthChecker:
-    return DetailedHealthChecker(coffee_client, settings.app_version, settings.git_commit_sha)
+async def coffee_client(container: t.Annotated[Container, Depends(container)]) -> CoffeeClient:
+    return container.coffee_client
 
 
-def simple_health_checker(
-    coffee_client: t.Annotated[CoffeeClient, Depends(coffee_client)],
-    settings: t.Annotated[Settings, Depends(settings)],
-) -> SimpleHealthChecker:
-    return SimpleHealthChecker(coffee_client, settings.app_version, settings.git_commit_sha)
+async def coffee_service(container: t.Annotated[Container, Depends(container)]) -> CoffeeService:
+    return container.coffee_service
+
+
+async def detailed_health_checker(container: t.Annotated[Container, Depends(container)]) -> DetailedHealthChecker:
+    return container.detailed_health_checker
+
+
+async def simple_health_checker(container: t.Annotated[Container, Depends(container)]) -> SimpleHealthChecker:
+    return container.simple_health_checker
+
+
+async def precompressed_cache(container: t.Annotated[Container, Depends(container)]) -> PrecompressedCache:
+    return container.precompressed_cache
+
+
+async def catalog_watcher(container: t.Annotated[Container, Depends(container)]) -> CatalogWatcher:
+    return container.catalog_watcher
+
+
+async def metrics_exporter(container: t.Annotated[Container, Depends(container)]) -> MetricsExporter:
+    return container.metrics_exporter
+
+
+async def tracer(container: t.Annotated[Container, Depends(container)]) -> Tracer:
+    return container.tracer
@@ -0,0 +1,82 @@
+import hashlib
+import typing as t
+
+from pydantic import BaseModel, TypeAdapter
+
+from python_service_template.domain.coffee.entity import CoffeeCategory, CoffeeDrink
+
+_categories_adapter = TypeAdapter(dict[CoffeeCategory, list[CoffeeDrink]])
+
+
+class CatalogDrink(BaseModel):
+    """A drink together with its category, ids alone are ambiguous across categories."""
+
+    category: CoffeeCategory
+    drink: CoffeeDrink
+
+
+class DrinksLookup(BaseModel):
+    drinks: list[CatalogDrink]
+    not_found: list[int]
+
+
+def pick_recommendation(hot: t.Iterable[CoffeeDrink]) -> CoffeeDrink | None:
+    """The drink to recommend among the hot drinks: the first espresso, if there is one."""
+    return next((drink for drink in hot if drink.title == "Espresso"), None)
+
+
+class CatalogChange(BaseModel):
+    """What changed between two observed versions of the catalog; ids are grouped per category."""
+
+    version: str
+    recommendation: CoffeeDrink | None
+    recommendation_changed: bool
+    added: dict[CoffeeCategory, list[int]]
+    removed: dict[CoffeeCategory, list[int]]
+
+
+class CoffeeCatalog:
+    """All hot and iced drinks of one catalog version, indexed by id.
+
+    Ids are only unique per category upstream, so an id can map to several drinks.
+    """
+
+    def __init__(self, hot: list[CoffeeDrink], iced: list[CoffeeDrink]) -> None:
+        self.hot = hot
+        self.iced = iced
+        self.drinks = hot + iced
+        self.by_id: dict[int, list[CatalogDrink]] = {}
+        for category, drinks in ((CoffeeCategory.HOT, hot), (CoffeeCategory.ICED, iced)):
+            for drink in drinks:
+                self.by_id.setdefault(drink.id, []).append(CatalogDrink(category=category, drink=drink))
+        # Hashed per category, a drink moving from hot to iced is a new version
+        content = _categories_adapter.dump_json({CoffeeCategory.HOT: hot, CoffeeCategory.ICED: iced})
+        self.version = hashlib.blake2b(content, digest_size=16).hexdigest()
+        self.recommendation = pick_recommendation(hot)
+
+    def lookup(self, ids: t.Iterable[int]) -> DrinksLookup:
+        drinks: list[CatalogDrink] = []
+        not_found: list[int] = []
+        for drink_id in dict.fromkeys(ids):
+            matches = self.by_id.get(drink_id)
+            if matches:
+                drinks.extend(matches)
+            else:
+                not_found.append(drink_id)
+        return DrinksLookup(drinks=drinks, not_found=not_found)
+
+    def ids(self, category: CoffeeCategory) -> set[int]:
+        return {drink.id for drink in (self.hot if category == CoffeeCategory.HOT else self.iced)}
+
+    def diff(
+        self, previous: "CoffeeCatalog | None"
+    ) -> tuple[dict[CoffeeCategory, list[int]], dict[CoffeeCategory, list[int]]]:
+        """Ids added and removed since ``previous``, everything counts as added when there is no previous catalog."""
+        added: dict[CoffeeCategory, list[int]] = {}
+        removed: dict[CoffeeCategory, list[int]] = {}
+        for category in CoffeeCategory:
+            current_ids = self.ids(category)
+            previous_ids = previous.ids(category) if previous is not None else set()
+            added[category] = sorted(current_ids - previous_ids)
+            removed[category] = sorted(previous_ids - current_ids)
+        return added, removed
@@ -1,3 +1,5 @@
+import enum
+
 from pydantic import BaseModel, HttpUrl
 
 
@@ -7,3 +9,8 @@ class CoffeeDrink(BaseModel):
     description: str
     image: HttpUrl | None
     ingredients: list[str]
+
+
+class CoffeeCategory(str, enum.Enum):
+    HOT = "hot"
+    ICED = "iced"
@@ -1,9 +1,14 @@
 import abc
+import asyncio
+import time
+import typing as t
 
 import structlog
 
-from python_service_template.domain.coffee.entity import CoffeeDrink
+from python_service_template.domain.coffee.catalog import CoffeeCatalog, DrinksLookup, pick_recommendation
+from python_service_template.domain.coffee.entity import CoffeeCategory, CoffeeDrink
 from python_service_template.domain.coffee.repository import CoffeeClient
+from python_service_template.tracing import span
 
 
 class CoffeeService(abc.ABC):
@@ -12,18 +17,74 @@ class CoffeeService(abc.ABC):
         """Recommend a drink from a list of drinks"""
         pass
 
+    @abc.abstractmethod
+    async def get_drinks(self, ids: t.Sequence[int]) -> DrinksLookup:
+        """Look up several drinks by id at once"""
+        pass
+
+    @abc.abstractmethod
+    async def export(self, categories: t.Collection[CoffeeCategory]) -> t.AsyncIterator[CoffeeDrink]:
+        """Fetch the drinks of the given categories and iterate over them one at a time"""
+        pass
+
+    @abc.abstractmethod
+    async def catalog(self) -> CoffeeCatalog:
+        """Get the current catalog of all drinks"""
+        pass
+
 
 class SimpleCoffeeService(CoffeeService):
-    def __init__(self, client: CoffeeClient) -> None:
+    def __init__(self, client: CoffeeClient, catalog_max_age: float = 0.0) -> None:
         self.client = client
+        self.catalog_max_age = catalog_max_age
         self.log = structlog.get_logger(__name__).bind(class_name=self.__class__.__name__)
+        self._catalog: CoffeeCatalog | None = None
+        self._catalog_fetched_at = 0.0
+        self._catalog_lock = asyncio.Lock()
 
     async def recommend(self) -> CoffeeDrink | None:
         await self.log.adebug("Recommending a drink")
-        drinks = await self.client.get_hot()
-        espresso = [drink for drink in drinks if drink.title == "Espresso"]
-        if espresso:
+        with span("SimpleCoffeeService.recommend") as recommend_span:
+            drinks = await self.client.get_hot()
+            espresso = pick_recommendation(drinks)
+            recommend_span.set_attribute("found", espresso is not None)
+        if espresso is not None:
             await self.log.adebug("Recommending espresso")
-            return espresso[0]
-        await self.log.awarn("Espresso not found")
+            return espresso
+        await self.log.awarning("Espresso not found")
         return None
+
+    async def get_drinks(self, ids: t.Sequence[int]) -> DrinksLookup:
+        await self.log.adebug("Looking up drinks", count=len(ids))
+        catalog = await self.catalog()
+        return catalog.lookup(ids)
+
+    async def export(self, categories: t.Collection[CoffeeCategory]) -> t.AsyncIterator[CoffeeDrink]:
+        await self.log.adebug("Exporting drinks", categories=sorted(categories))
+        # Served from the shared catalog, no per-request copy of the drinks; fetched before iterating so upstream errors
+        # surface before a caller starts streaming a response
+        catalog = await self.catalog()
+        drinks = {CoffeeCategory.HOT: catalog.hot, CoffeeCategory.ICED: catalog.iced}
+        return _iterate([drinks[category] for category in CoffeeCategory if category in categories])
+
+    async def catalog(self) -> CoffeeCatalog:
+        """Return the cached catalog, refreshing it once it is older than ``catalog_max_age`` seconds."""
+        async with self._catalog_lock:
+            if self._catalog is None or time.monotonic() - self._catalog_fetched_at >= self.catalog_max_age:
+                await self._refresh_catalog()
+            return t.cast(CoffeeCatalog, self._catalog)
+
+    async def _refresh_catalog(self) -> None:
+        hot, iced = await asyncio.gather(self.client.get_hot(), self.client.get_iced())
+        self._catalog_fetched_at = time.monotonic()
+        # Clients hand out the same lists while the upstream data is unchanged, keep the index in that case
+        if self._catalog is not None and self._catalog.hot is hot and self._catalog.iced is iced:
+            return
+        await self.log.adebug("Rebuilding coffee catalog index")
+        self._catalog = CoffeeCatalog(hot, iced)
+
+
+async def _iterate(chunks: list[list[CoffeeDrink]]) -> t.AsyncIterator[CoffeeDrink]:
+    for drinks in chunks:
+        for drink in drinks:
+            yield drink
@@ -0,0 +1,52 @@
+import asyncio
+import contextlib
+import typing as t
+
+
+class Subscription[T]:
+    """Bounded buffer of one subscriber, the oldest item is dropped when a slow subscriber falls behind."""
+
+    def __init__(self, buffer_size: int) -> None:
+        self.dropped = 0
+        self._queue: asyncio.Queue[T] = asyncio.Queue(maxsize=buffer_size)
+
+    def put(self, item: T) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(item)
+
+    async def get(self, timeout: float | None = None) -> T | None:
+        """Wait for the next item, ``None`` means nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class Broadcaster[T]:
+    """In-process fan-out of published items to every current subscriber.
+
+    Publishing never blocks, each subscriber has its own bounded buffer. Every worker process has its own broadcaster,
+    so subscribers only see items published in the worker that serves them.
+    """
+
+    def __init__(self, buffer_size: int = 16) -> None:
+        self.buffer_size = buffer_size
+        self._subscriptions: set[Subscription[T]] = set()
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    @contextlib.contextmanager
+    def subscribe(self) -> t.Iterator[Subscription[T]]:
+        subscription = Subscription[T](self.buffer_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, item: T) -> None:
+        for subscription in self._subscriptions:
+            subscription.put(item)
@@ -0,0 +1,86 @@
+import asyncio
+import contextlib
+import time
+import typing as t
+
+import structlog
+
+from python_service_template.domain.coffee.catalog import CatalogChange, CoffeeCatalog
+from python_service_template.domain.coffee.service import CoffeeService
+from python_service_template.infrastructure.broadcast import Broadcaster
+
+
+class CatalogWatcher:
+    """Periodically refresh the catalog and recommendation and publish a ``CatalogChange`` whenever either changed.
+
+    Refreshes only happen while the broadcaster has subscribers, a worker without listeners does not poll upstream. New
+    subscribers do not wait for the next refresh, ``ensure_latest`` checks right away when the last check is older than
+    ``interval`` (e.g. because nobody was subscribed in the meantime).
+    """
+
+    def __init__(self, service: CoffeeService, broadcaster: Broadcaster[CatalogChange], interval: float) -> None:
+        self.service = service
+        self.broadcaster = broadcaster
+        self.interval = interval
+        self.latest: CatalogChange | None = None
+        self.log = structlog.get_logger(__name__).bind(class_name=self.__class__.__name__)
+        self._catalog: CoffeeCatalog | None = None
+        self._lock = asyncio.Lock()
+        self._checked_at = 0.0
+
+    async def check(self) -> CatalogChange | None:
+        async with self._lock:
+            return await self._check()
+
+    async def ensure_latest(self) -> CatalogChange | None:
+        """Return the latest change, checking the catalog first if it may be outdated; failures are logged."""
+        async with self._lock:
+            if self.latest is None or time.monotonic() - self._checked_at >= self.interval:
+                try:
+                    await self._check()
+                except Exception:
+                    await self.log.awarning("Refreshing the coffee catalog failed", exc_info=True)
+            return self.latest
+
+    async def _check(self) -> CatalogChange | None:
+        # The recommendation is taken from the same catalog, so an event never mixes two upstream snapshots
+        catalog = await self.service.catalog()
+        self._checked_at = time.monotonic()
+        recommendation = catalog.recommendation
+        previous = self.latest
+        if previous is not None and previous.version == catalog.version:
+            return None
+
+        added, removed = catalog.diff(self._catalog)
+        change = CatalogChange(
+            version=catalog.version,
+            recommendation=recommendation,
+            recommendation_changed=previous is None or previous.recommendation != recommendation,
+            added=added,
+            removed=removed,
+        )
+        self._catalog = catalog
+        self.latest = change
+        await self.log.ainfo("Coffee catalog changed", version=change.version, subscribers=len(self.broadcaster))
+        self.broadcaster.publish(change)
+        return change
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if not len(self.broadcaster):
+                continue
+            try:
+                await self.check()
+            except Exception:
+                await self.log.awarning("Refreshing the coffee catalog failed", exc_info=True)
+
+    @contextlib.asynccontextmanager
+    async def running(self) -> t.AsyncIterator["CatalogWatcher"]:
+        task = asyncio.create_task(self._run())
+        try:
+            yield self
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
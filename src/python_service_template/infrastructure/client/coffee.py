@@ -1,11 +1,17 @@
+import contextlib
+import hashlib
 import typing as t
 
-import aiohttp
 import structlog
 from pydantic import BaseModel, BeforeValidator, Field, HttpUrl, RootModel
 
 from python_service_template.domain.coffee.entity import CoffeeDrink
 from python_service_template.domain.coffee.repository import CoffeeClient, CoffeeClientError
+from python_service_template.tracing import span
+
+if t.TYPE_CHECKING:
+    # aiohttp is imported lazily, it is only needed once a request is made and is a big part of the import time
+    import aiohttp
 
 
 class CoffeeDrinkDTO(BaseModel):
@@ -31,14 +37,36 @@ class CoffeeDrinksDTO(RootModel[list[CoffeeDrinkDTO]]):
     root: list[CoffeeDrinkDTO]
 
 
+class CachedDrinks(t.NamedTuple):
+    """Last successful response of an endpoint together with what is needed to revalidate it."""
+
+    etag: str | None
+    last_modified: str | None
+    digest: str
+    drinks: list[CoffeeDrink]
+
+
 class AsyncCoffeeClient(CoffeeClient):
-    def __init__(self, base_url: str) -> None:
+    def __init__(self, base_url: str, session: "aiohttp.ClientSession | None" = None) -> None:
         self.base_url = base_url
+        self.session = session
         self.log = structlog.get_logger(__name__).bind(class_name=self.__class__.__name__)
+        self._cache: dict[str, CachedDrinks] = {}
+
+    @contextlib.asynccontextmanager
+    async def _session(self) -> t.AsyncIterator["aiohttp.ClientSession"]:
+        # Reuse the shared session (and its connection pool) when given one, otherwise fall back to a short-lived one
+        if self.session is not None:
+            yield self.session
+        else:
+            import aiohttp
+
+            async with aiohttp.ClientSession() as session:
+                yield session
 
     async def healthy(self) -> bool:
         await self.log.adebug("Performing healthcheck")
-        async with aiohttp.ClientSession() as session:
+        async with self._session() as session:
             async with session.get(f"{self.base_url}/hot") as response:
                 return response.status == 200
 
@@ -48,28 +76,56 @@ class AsyncCoffeeClient(CoffeeClient):
 
     async def get_hot(self) -> list[CoffeeDrink]:
         await self.log.adebug("Fetching hot coffee drinks")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}/hot") as response:
-                if response.status == 200:
-                    deserialized = await response.json()
-                    try:
-                        drinks = CoffeeDrinksDTO.model_validate(deserialized)
-                    except Exception as exc:
-                        raise CoffeeClientError("Malformed data from /hot endpoint") from exc
-                    return [drink.to_domain() for drink in drinks.root]
-                else:
-                    raise CoffeeClientError(f"Error fetching data: {response.status}")
+        with span("AsyncCoffeeClient.get_hot"):
+            return await self._get_drinks("hot")
 
     async def get_iced(self) -> list[CoffeeDrink]:
         await self.log.adebug("Fetching iced coffee drinks")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}/iced") as response:
-                if response.status == 200:
-                    deserialized = await response.json()
-                    try:
-                        drinks = CoffeeDrinksDTO.model_validate(deserialized)
-                    except Exception as exc:
-                        raise CoffeeClientError("Malformed data from /iced endpoint") from exc
-                    return [drink.to_domain() for drink in drinks.root]
-                else:
-                    raise CoffeeClientError(f"Error fetching data: {response.status}")
+        with span("AsyncCoffeeClient.get_iced"):
+            return await self._get_drinks("iced")
+
+    async def _get_drinks(self, endpoint: str) -> list[CoffeeDrink]:
+        """Fetch and validate the drinks of an endpoint, reusing the previous result when it did not change.
+
+        The upstream is asked to revalidate with ``If-None-Match``/``If-Modified-Since`` when it sent validators, a
+        ``304 Not Modified`` then skips the body transfer entirely. Without validators a hash of the body still lets
+        us skip JSON decoding and validation. In both cases the previously returned list is returned again, callers
+        must not mutate it.
+        """
+        cached = self._cache.get(endpoint)
+        headers = {}
+        if cached is not None and cached.etag is not None:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified is not None:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        with span("http.request", **{"http.method": "GET", "http.route": f"/{endpoint}"}) as request_span:
+            async with self._session() as session:
+                async with session.get(f"{self.base_url}/{endpoint}", headers=headers) as response:
+                    request_span.set_attribute("http.status_code", response.status)
+                    if response.status == 304 and cached is not None:
+                        await self.log.adebug("Coffee drinks not modified", endpoint=endpoint)
+                        return cached.drinks
+                    if response.status != 200:
+                        raise CoffeeClientError(f"Error fetching data: {response.status}")
+                    body = await response.read()
+                    request_span.set_attribute("http.response.body.size", len(body))
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        if cached is not None and cached.digest == digest:
+            await self.log.adebug("Coffee drinks unchanged", endpoint=endpoint)
+            drinks = cached.drinks
+        else:
+            try:
+                # pydantic parses and validates the JSON in a single pass, so decoding has no span of its own
+                with span("CoffeeDrinksDTO.model_validate_json", size=len(body)):
+                    dtos = CoffeeDrinksDTO.model_validate_json(body).root
+            except Exception as exc:
+                raise CoffeeClientError(f"Malformed data from /{endpoint} endpoint") from exc
+            with span("CoffeeDrinkDTO.to_domain", count=len(dtos)):
+                drinks = [drink.to_domain() for drink in dtos]
+
+        self._cache[endpoint] = CachedDrinks(etag, last_modified, digest, drinks)
+        return drinks
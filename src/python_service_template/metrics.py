@@ -0,0 +1,81 @@
+"""Prometheus metrics exposition that stays correct when uvicorn runs several worker processes.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set before the workers import prometheus_client, metric values live in mmap-backed
+files in that directory and every worker aggregates all of them when it is scraped.
+``python -m python_service_template`` sets the directory up automatically when ``WORKERS`` is greater than one.
+"""
+
+import asyncio
+import os
+import pathlib
+import re
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+
+from python_service_template.compression import PrecompressedCache
+
+_LIVE_GAUGE_FILE = re.compile(r"^gauge_live\w*_(\d+)\.db$")
+
+
+def multiprocess_dir() -> pathlib.Path | None:
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    return pathlib.Path(path) if path else None
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def cleanup_dead_workers(path: pathlib.Path) -> list[int]:
+    """Remove the live gauge files of worker processes that no longer exist, e.g. after a crash.
+
+    Counters and histograms of dead workers are kept on purpose, their values still count towards the totals.
+    """
+    pids = {int(match.group(1)) for file in path.iterdir() if (match := _LIVE_GAUGE_FILE.match(file.name))}
+    dead = sorted(pid for pid in pids if not _is_alive(pid))
+    for pid in dead:
+        multiprocess.mark_process_dead(pid, str(path))
+    return dead
+
+
+def mark_worker_stopped(path: pathlib.Path) -> None:
+    multiprocess.mark_process_dead(os.getpid(), str(path))
+
+
+class MetricsExporter:
+    """Render the registry at most once per ``ttl`` seconds, concurrent scrapes share a single rendering."""
+
+    media_type = CONTENT_TYPE_LATEST
+
+    def __init__(self, registry: CollectorRegistry, ttl: float) -> None:
+        self.registry = registry
+        self.ttl = ttl
+        # Only the variants of the current payload are worth keeping, one per encoding
+        self.cache = PrecompressedCache(max_entries=4)
+        self._payload: bytes | None = None
+        self._rendered_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_environment(cls, ttl: float) -> "MetricsExporter":
+        path = multiprocess_dir()
+        if path is None:
+            return cls(REGISTRY, ttl)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=str(path))
+        return cls(registry, ttl)
+
+    async def render(self) -> bytes:
+        async with self._lock:
+            if self._payload is None or time.monotonic() - self._rendered_at >= self.ttl:
+                # In multiprocess mode this reads and merges the files of all workers, keep it off the event loop
+                self._payload = await asyncio.to_thread(generate_latest, self.registry)
+                self._rendered_at = time.monotonic()
+            return self._payload
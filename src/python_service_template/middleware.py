@@ -0,0 +1,181 @@
+import itertools
+import os
+import random
+import time
+import typing as t
+import uuid
+
+from asgi_correlation_id import correlation_id
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from python_service_template.settings import IdGenerator
+from python_service_template.tracing import Trace, Tracer
+
+ALLOWED_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+
+def uuid4_id() -> str:
+    return uuid.uuid4().hex
+
+
+def random_id() -> str:
+    # Same shape as a uuid4 hex, without the urandom syscall and UUID object; ids only need to be unique, not secret
+    return f"{random.getrandbits(128):032x}"
+
+
+class SequentialId:
+    """Random per-process prefix followed by a counter, the cheapest unique id for a single process.
+
+    The prefix is drawn when the generator is created, create one per worker process (not before forking).
+    """
+
+    def __init__(self) -> None:
+        self._prefix = os.urandom(8).hex()
+        self._counter = itertools.count()
+
+    def __call__(self) -> str:
+        return f"{self._prefix}{next(self._counter):016x}"
+
+
+def create_id_generator(kind: IdGenerator) -> t.Callable[[], str]:
+    match kind:
+        case IdGenerator.UUID4:
+            return uuid4_id
+        case IdGenerator.RANDOM:
+            return random_id
+        case IdGenerator.SEQUENTIAL:
+            return SequentialId()
+
+
+class RequestContextMiddleware:
+    """Correlation id, CORS and timing handled in a single pass over the request and response headers.
+
+    Replaces ``CorrelationIdMiddleware`` and ``CORSMiddleware``: the request id is read from (or added to) the request
+    headers, stored in the ``asgi_correlation_id`` context variable used for logging and echoed on the response. CORS
+    preflight requests are answered without calling the application, all methods and request headers are allowed
+    for the configured origins. Every response gets a ``Server-Timing`` header with the time until it started. With a
+    ``tracer``, sampled requests are traced under their correlation id.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        header_name: str = "X-Request-ID",
+        generator: t.Callable[[], str] = uuid4_id,
+        allow_origins: t.Sequence[str] = (),
+        allow_credentials: bool = False,
+        expose_headers: t.Sequence[str] = (),
+        max_age: int = 600,
+        tracer: Tracer | None = None,
+    ) -> None:
+        self.app = app
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.header_name = header_name.lower().encode("latin-1")
+        self.generator = generator
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self.allow_credentials = allow_credentials
+
+        # Response headers that do not depend on the request are built once
+        self.cors_headers: list[tuple[bytes, bytes]] = []
+        if allow_credentials:
+            self.cors_headers.append((b"access-control-allow-credentials", b"true"))
+        if expose_headers:
+            self.cors_headers.append((b"access-control-expose-headers", ", ".join(expose_headers).encode("latin-1")))
+        self.preflight_headers = [
+            (b"access-control-allow-methods", ALLOWED_METHODS),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            *self.cors_headers,
+        ]
+
+    def allowed_origin(self, origin: bytes) -> bytes | None:
+        """The ``Access-Control-Allow-Origin`` value for ``origin``, ``None`` if it is not allowed."""
+        if self.allow_all_origins and not self.allow_credentials:
+            return b"*"
+        if self.allow_all_origins or origin in self.allow_origins:
+            return origin
+        return None
+
+    def scan_headers(self, scope: Scope) -> tuple[bytes | None, bytes | None, bytes | None, bytes | None]:
+        """Request id, ``Origin``, ``Access-Control-Request-Method`` and ``-Headers`` in one pass over the headers."""
+        request_id = origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == self.header_name:
+                request_id = value
+            elif name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        return request_id, origin, request_method, request_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_id, origin, request_method, request_headers = self.scan_headers(scope)
+        if not request_id:
+            request_id = self.generator().encode("latin-1")
+            scope["headers"] = [*scope["headers"], (self.header_name, request_id)]
+        request_cid = request_id.decode("latin-1")
+        correlation_id.set(request_cid)
+
+        response_headers = [(self.header_name, request_id)]
+        if origin is not None and scope["type"] == "http":
+            allow_origin = self.allowed_origin(origin)
+            response_headers.append((b"vary", b"Origin"))
+            if scope["method"] == "OPTIONS" and request_method is not None:
+                await self.preflight(send, response_headers, allow_origin, request_headers)
+                return
+            if allow_origin is not None:
+                response_headers.append((b"access-control-allow-origin", allow_origin))
+                response_headers.extend(self.cors_headers)
+
+        trace = self.start_trace(scope, request_cid)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                duration = (time.perf_counter() - start) * 1000
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    *response_headers,
+                    (b"server-timing", f"app;dur={duration:.2f}".encode("latin-1")),
+                ]
+                if trace is not None:
+                    trace.response_started()
+                    trace.root.set_attribute("http.status_code", message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            if trace is not None:
+                await self.tracer.finish(trace)
+
+    def start_trace(self, scope: Scope, request_id: str) -> Trace | None:
+        if scope["type"] != "http":
+            return None
+        return self.tracer.start(f"{scope['method']} {scope['path']}", request_id, **{"http.method": scope["method"]})
+
+    async def preflight(
+        self,
+        send: Send,
+        headers: list[tuple[bytes, bytes]],
+        allow_origin: bytes | None,
+        request_headers: bytes | None,
+    ) -> None:
+        headers.extend(self.preflight_headers)
+        if request_headers is not None:
+            headers.append((b"access-control-allow-headers", request_headers))
+        if allow_origin is not None:
+            status, body = 200, b"OK"
+            headers.append((b"access-control-allow-origin", allow_origin))
+        else:
+            status, body = 400, b"Disallowed CORS origin"
+        headers.append((b"content-type", b"text/plain; charset=utf-8"))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
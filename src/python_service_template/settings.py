@@ -1,6 +1,7 @@
 import enum
 import functools
 import logging
+import pathlib
 import sys
 import typing as t
 
@@ -25,8 +26,66 @@ class LoggingConfig(BaseModel):
     )
 
 
+class IdGenerator(str, enum.Enum):
+    UUID4 = "uuid4"
+    RANDOM = "random"
+    SEQUENTIAL = "sequential"
+
+
+class CorrelationIdConfig(BaseModel):
+    header_name: str = Field(default="X-Request-ID", description="Header carrying the correlation id")
+    generator: IdGenerator = Field(
+        default=IdGenerator.UUID4,
+        description="How ids are generated for requests without one: uuid4, random (same format, cheaper) "
+        "or sequential (per-process prefix and counter, cheapest)",
+    )
+
+
 class CoffeeApi(BaseModel):
     host: str = Field(description="Coffee API host URL")
+    pool_size: int = Field(default=100, description="Maximum number of open connections to the Coffee API", ge=1)
+    catalog_max_age: float = Field(
+        default=10.0, description="Seconds the drinks catalog is served from memory before it is revalidated", ge=0
+    )
+
+
+class CompressionConfig(BaseModel):
+    minimum_size: int = Field(
+        default=500, description="Responses smaller than this many bytes are not compressed", ge=0
+    )
+    cache_size: int = Field(default=256, description="Maximum number of precompressed payload variants kept", ge=1)
+
+
+class CatalogEventsConfig(BaseModel):
+    refresh_interval: float = Field(
+        default=30.0, description="Seconds between background checks of the catalog for changes", gt=0
+    )
+    heartbeat_interval: float = Field(
+        default=15.0, description="Seconds after which an idle event stream receives a heartbeat", gt=0
+    )
+    buffer_size: int = Field(
+        default=16, description="Events buffered per subscriber before the oldest is dropped", ge=1
+    )
+
+
+class MetricsConfig(BaseModel):
+    cache_ttl: float = Field(
+        default=5.0, description="Seconds a rendered /metrics payload is reused for subsequent scrapes", ge=0
+    )
+
+
+class TracingConfig(BaseModel):
+    sample_rate: float = Field(default=0.0, description="Fraction of requests that are traced", ge=0, le=1)
+    slow_threshold_ms: float = Field(
+        default=500.0,
+        description="Traced requests whose response takes at least this long to start are kept as slow traces",
+        ge=0,
+    )
+    buffer_size: int = Field(default=100, description="Number of recent slow traces kept per worker", ge=1)
+    export_path: pathlib.Path | None = Field(
+        default=None, description="Append every traced request to this file as OTLP JSON"
+    )
+    expose_traces: bool = Field(default=False, description="Serve the slow trace buffer on /admin/traces")
 
 
 class Settings(BaseSettings):
@@ -35,6 +94,17 @@ class Settings(BaseSettings):
     workers: int = Field(default=1, description="Number of worker processes")
     logging: LoggingConfig = Field(description="Logging configuration settings")
     coffee_api: CoffeeApi = Field(description="Coffee API configuration")
+    correlation_id: CorrelationIdConfig = Field(
+        default_factory=CorrelationIdConfig, description="Correlation id configuration"
+    )
+    compression: CompressionConfig = Field(
+        default_factory=CompressionConfig, description="Response compression configuration"
+    )
+    catalog_events: CatalogEventsConfig = Field(
+        default_factory=CatalogEventsConfig, description="Catalog change notification configuration"
+    )
+    tracing: TracingConfig = Field(default_factory=TracingConfig, description="Request tracing configuration")
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig, description="Prometheus metrics configuration")
     app_version: str = Field(default="0.1.0", description="Application version", min_length=1)
     git_commit_sha: str = Field(default="sha", description="Git commit SHA", min_length=1)
 
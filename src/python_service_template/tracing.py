@@ -0,0 +1,251 @@
+"""Lightweight in-process tracing.
+
+A trace is started per sampled request by ``RequestContextMiddleware`` and identified by the request's correlation id.
+Code on the request path marks its phases with ``span``, which is close to free when the request is not sampled::
+
+    with span("SimpleCoffeeService.recommend"):
+        ...
+
+Traces slower than the configured threshold are kept in a ring buffer (served on ``/admin/traces`` when enabled) and
+every sampled trace can be appended to a file as OTLP JSON, readable by OpenTelemetry tooling without a collector.
+"""
+
+import asyncio
+import collections
+import contextvars
+import hashlib
+import json
+import pathlib
+import random
+import re
+import threading
+import time
+import typing as t
+
+import structlog
+
+from python_service_template.settings import TracingConfig
+
+AttributeValue = str | int | float | bool
+
+_HEX_TRACE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, name: str, parent_id: int | None, attributes: dict[str, AttributeValue]) -> None:
+        self.name = name
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.attributes[key] = value
+
+
+class Trace:
+    __slots__ = ("trace_id", "correlation_id", "root", "spans", "response_ns", "_tokens")
+
+    def __init__(self, name: str, correlation_id: str, attributes: dict[str, AttributeValue]) -> None:
+        self.trace_id = trace_id_for(correlation_id)
+        self.correlation_id = correlation_id
+        self.root = Span(name, None, attributes)
+        self.spans = [self.root]
+        self.response_ns = 0
+        self._tokens: tuple[contextvars.Token[Trace | None], contextvars.Token[Span | None]] | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    @property
+    def response_ms(self) -> float:
+        """Time until the response started, the whole trace if it never did."""
+        return ((self.response_ns or self.root.end_ns) - self.root.start_ns) / 1_000_000
+
+    def response_started(self) -> None:
+        self.response_ns = time.time_ns()
+
+
+_current_trace: contextvars.ContextVar[Trace | None] = contextvars.ContextVar("trace", default=None)
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("span", default=None)
+
+
+def trace_id_for(correlation_id: str) -> str:
+    """Use the correlation id as trace id when it already has the OTLP shape, otherwise derive one from it."""
+    if _HEX_TRACE_ID.match(correlation_id):
+        return correlation_id
+    return hashlib.blake2b(correlation_id.encode(), digest_size=16).hexdigest()
+
+
+class _SpanContext:
+    __slots__ = ("trace", "span", "token")
+
+    def __init__(self, trace: Trace, span: Span) -> None:
+        self.trace = trace
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.trace.spans.append(self.span)
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_: t.Any) -> None:
+        self.span.end_ns = time.time_ns()
+        if exc_type is not None:
+            self.span.attributes["error"] = exc_type.__name__
+        _current_span.reset(self.token)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *_: t.Any) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes: AttributeValue) -> t.ContextManager[Span | _NoopSpan]:
+    """Time a block as a child of the current span, a no-op outside of a sampled trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    parent = _current_span.get()
+    return _SpanContext(trace, Span(name, parent.span_id if parent is not None else None, attributes))
+
+
+class OtlpJsonFileExporter:
+    """Append traces to a file in the OTLP/JSON format, one ``ExportTraceServiceRequest`` per line."""
+
+    def __init__(self, path: pathlib.Path, service_name: str, service_version: str) -> None:
+        self.path = path
+        self.resource = {
+            "attributes": [
+                _otlp_attribute("service.name", service_name),
+                _otlp_attribute("service.version", service_version),
+            ]
+        }
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": self.resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [_otlp_span(trace, span) for span in trace.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        line = json.dumps(request, separators=(",", ":")) + "\n"
+        # A single write per trace, so lines of concurrent exports (and workers) do not interleave
+        with self._lock, self.path.open("a", encoding="utf-8") as file:
+            file.write(line)
+
+
+def _otlp_attribute(key: str, value: AttributeValue) -> dict[str, t.Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": value}}
+
+
+def _otlp_span(trace: Trace, span: Span) -> dict[str, t.Any]:
+    attributes = dict(span.attributes)
+    if span is trace.root:
+        attributes["correlation_id"] = trace.correlation_id
+    otlp_span = {
+        "traceId": trace.trace_id,
+        "spanId": f"{span.span_id:016x}",
+        "name": span.name,
+        # SPAN_KIND_SERVER for the request, SPAN_KIND_INTERNAL for everything below it
+        "kind": 2 if span is trace.root else 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_otlp_attribute(key, value) for key, value in attributes.items()],
+    }
+    if span.parent_id is not None:
+        otlp_span["parentSpanId"] = f"{span.parent_id:016x}"
+    return otlp_span
+
+
+class Tracer:
+    """Samples requests into traces and keeps the most recent slow ones.
+
+    A trace is slow when its response took ``slow_threshold_ms`` to start, streamed responses (event streams, exports)
+    stay open for as long as the client listens and would otherwise crowd out the slow requests.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        slow_threshold_ms: float = 500.0,
+        buffer_size: int = 100,
+        exporter: OtlpJsonFileExporter | None = None,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.exporter = exporter
+        self.slow_traces: collections.deque[Trace] = collections.deque(maxlen=buffer_size)
+        self.log = structlog.get_logger(__name__).bind(class_name=self.__class__.__name__)
+
+    def configure(self, config: TracingConfig, service_name: str, service_version: str) -> None:
+        self.sample_rate = config.sample_rate
+        self.slow_threshold_ms = config.slow_threshold_ms
+        self.slow_traces = collections.deque(self.slow_traces, maxlen=config.buffer_size)
+        self.exporter = (
+            OtlpJsonFileExporter(config.export_path, service_name, service_version)
+            if config.export_path is not None
+            else None
+        )
+
+    def start(self, name: str, correlation_id: str, **attributes: AttributeValue) -> Trace | None:
+        """Start a trace in the current context if the request is sampled."""
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return None
+        trace = Trace(name, correlation_id, attributes)
+        trace._tokens = (_current_trace.set(trace), _current_span.set(trace.root))
+        return trace
+
+    async def finish(self, trace: Trace) -> None:
+        trace.root.end_ns = time.time_ns()
+        if trace._tokens is not None:
+            _current_trace.reset(trace._tokens[0])
+            _current_span.reset(trace._tokens[1])
+        if trace.response_ms >= self.slow_threshold_ms:
+            self.slow_traces.append(trace)
+        if self.exporter is not None:
+            try:
+                await asyncio.to_thread(self.exporter.export, trace)
+            except OSError:
+                await self.log.awarning("Exporting trace failed", path=str(self.exporter.path), exc_info=True)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """The tracer of this process, configured from the settings in the application lifespan."""
+    return _tracer
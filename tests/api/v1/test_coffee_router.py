@@ -0,0 +1,154 @@
+import json
+import typing as t
+
+import pytest
+from fastapi.testclient import TestClient
+
+from python_service_template.api.v1.coffee import catalog_events_stream, catalog_payload, ndjson
+from python_service_template.app import app
+from python_service_template.dependencies import coffee_service
+from python_service_template.domain.coffee.catalog import CatalogChange, CoffeeCatalog
+from python_service_template.domain.coffee.entity import CoffeeDrink
+from python_service_template.infrastructure.broadcast import Broadcaster
+from python_service_template.infrastructure.catalog_watcher import CatalogWatcher
+
+
+@pytest.fixture
+def client(stub_coffee_service):
+    app.dependency_overrides[coffee_service] = lambda: stub_coffee_service
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("query", ["ids=2&ids=3&ids=1", "ids=2,3,1", "ids=2,3&ids=1"])
+def test_get_drinks(client, query):
+    response = client.get(f"/api/v1/coffee/drinks?{query}")
+    assert response.status_code == 200
+    body = response.json()
+    assert [(drink["category"], drink["title"]) for drink in body["drinks"]] == [
+        ("hot", "Latte"),
+        ("hot", "Espresso"),
+        ("iced", "Iced Coffee"),
+    ]
+    assert body["notFound"] == [3]
+
+
+def test_post_drinks(client, coffee_catalog):
+    response = client.post("/api/v1/coffee/drinks", json={"ids": [1, 4]})
+    assert response.status_code == 200
+    drinks = [
+        {**coffee_catalog.hot[0].model_dump(mode="json"), "category": "hot"},
+        {**coffee_catalog.iced[0].model_dump(mode="json"), "category": "iced"},
+    ]
+    assert response.json() == {"drinks": drinks, "notFound": [4]}
+
+
+def test_get_catalog_is_precompressed_per_version(client, stub_coffee_service):
+    drinks = [
+        CoffeeDrink(id=i, title=f"Drink {i}", description="Test", image=None, ingredients=["coffee"]) for i in range(50)
+    ]
+    stub_coffee_service.current = CoffeeCatalog(hot=drinks, iced=[])
+    version = stub_coffee_service.current.version
+
+    response = client.get("/api/v1/coffee/catalog", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == f'W/"{version}"'
+    body = response.json()
+    assert body["version"] == version
+    assert [drink["title"] for drink in body["hot"]] == [drink.title for drink in drinks]
+
+    cached = client.get("/api/v1/coffee/catalog", headers={"Accept-Encoding": "gzip"})
+    assert cached.content == response.content
+    assert catalog_payload.cache_info().hits >= 1
+    revalidated = client.get("/api/v1/coffee/catalog", headers={"If-None-Match": f'W/"{version}"'})
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.parametrize("query", ["", "ids=a", "ids=,", "ids=" + ",".join(map(str, range(101)))])
+def test_get_drinks_rejects_invalid_ids(client, query):
+    assert client.get(f"/api/v1/coffee/drinks?{query}").status_code == 422
+
+
+@pytest.mark.parametrize("ids", [[], list(range(101))])
+def test_post_drinks_rejects_invalid_ids(client, ids):
+    assert client.post("/api/v1/coffee/drinks", json={"ids": ids}).status_code == 422
+
+
+@pytest.mark.parametrize(
+    ("query", "titles"),
+    [
+        ("", ["Espresso", "Latte", "Iced Coffee"]),
+        ("?category=iced", ["Iced Coffee"]),
+        ("?category=hot&category=iced", ["Espresso", "Latte", "Iced Coffee"]),
+    ],
+)
+def test_export_drinks(client, query, titles):
+    response = client.get(f"/api/v1/coffee/drinks/export{query}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["title"] for line in response.text.splitlines()] == titles
+
+
+async def test_ndjson_buffers_lines_into_chunks(coffee_catalog):
+    async def drinks() -> t.AsyncIterator[CoffeeDrink]:
+        for drink in coffee_catalog.drinks:
+            yield drink
+
+    lines = [drink.model_dump_json().encode() + b"\n" for drink in coffee_catalog.drinks]
+    assert [chunk async for chunk in ndjson(drinks())] == [b"".join(lines)]
+    chunks = [chunk async for chunk in ndjson(drinks(), chunk_size=len(lines[0]) + 1)]
+    assert chunks == [lines[0] + lines[1], lines[2]]
+
+
+def test_export_drinks_rejects_unknown_category(client):
+    assert client.get("/api/v1/coffee/drinks/export?category=lukewarm").status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_catalog_events_stream(stub_coffee_service):
+    watcher = CatalogWatcher(stub_coffee_service, Broadcaster[CatalogChange](), interval=60)
+    initial = await watcher.check()
+    assert initial is not None
+    stream = catalog_events_stream(watcher, heartbeat_interval=0.01, last_event_id=None)
+
+    assert await anext(stream) == b"retry: 5000\n\n"
+    frame = (await anext(stream)).decode()
+    assert frame.startswith(f"event: catalog\nid: {initial.version}\ndata: ")
+    data = json.loads(frame.splitlines()[2].removeprefix("data: "))
+    assert data["recommendationChanged"] is True
+    assert data["added"] == {"hot": [1, 2], "iced": [1]}
+    assert await anext(stream) == b": heartbeat\n\n"
+
+    change = initial.model_copy(update={"version": "next", "recommendation_changed": False})
+    watcher.broadcaster.publish(change)
+    assert (await anext(stream)).startswith(b"event: catalog\nid: next\n")
+    await stream.aclose()
+    assert len(watcher.broadcaster) == 0
+
+
+@pytest.mark.asyncio
+async def test_first_subscriber_gets_the_catalog_without_waiting_for_a_refresh(stub_coffee_service):
+    watcher = CatalogWatcher(stub_coffee_service, Broadcaster[CatalogChange](), interval=60)
+    stream = catalog_events_stream(watcher, heartbeat_interval=0.01, last_event_id=None)
+
+    assert await anext(stream) == b"retry: 5000\n\n"
+    frame = await anext(stream)
+    latest = t.cast(CatalogChange, watcher.latest)
+    assert frame.startswith(f"event: catalog\nid: {latest.version}\n".encode())
+    # Delivered once, not again through the subscription
+    assert await anext(stream) == b": heartbeat\n\n"
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_catalog_events_stream_skips_known_version(stub_coffee_service):
+    watcher = CatalogWatcher(stub_coffee_service, Broadcaster[CatalogChange](), interval=60)
+    initial = await watcher.check()
+    assert initial is not None
+    stream = catalog_events_stream(watcher, heartbeat_interval=0.01, last_event_id=initial.version)
+
+    assert await anext(stream) == b"retry: 5000\n\n"
+    assert await anext(stream) == b": heartbeat\n\n"
+    await stream.aclose()
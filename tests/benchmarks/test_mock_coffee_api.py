@@ -0,0 +1,33 @@
+import pytest
+
+from benchmarks.mock_coffee_api import MockApiConfig, create_mock_app
+from python_service_template.domain.coffee.repository import CoffeeClientError
+from python_service_template.infrastructure.client.coffee import AsyncCoffeeClient
+
+
+@pytest.mark.asyncio
+async def test_mock_api_serves_valid_catalog(aiohttp_client):
+    client = await aiohttp_client(create_mock_app(MockApiConfig(catalog_size=5)))
+    coffee_client = AsyncCoffeeClient(base_url=str(client.make_url("")))
+    hot = await coffee_client.get_hot()
+    iced = await coffee_client.get_iced()
+    assert len(hot) == len(iced) == 5
+    assert hot[0].title == "Espresso"
+
+
+@pytest.mark.asyncio
+async def test_mock_api_error_rate(aiohttp_client):
+    client = await aiohttp_client(create_mock_app(MockApiConfig(error_rate=1.0)))
+    coffee_client = AsyncCoffeeClient(base_url=str(client.make_url("")))
+    with pytest.raises(CoffeeClientError):
+        await coffee_client.get_hot()
+
+
+@pytest.mark.asyncio
+async def test_mock_api_etag(aiohttp_client):
+    client = await aiohttp_client(create_mock_app(MockApiConfig(etag=True)))
+    response = await client.get("/hot")
+    etag = response.headers["ETag"]
+    assert response.status == 200
+    response = await client.get("/hot", headers={"If-None-Match": etag})
+    assert response.status == 304
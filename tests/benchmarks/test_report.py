@@ -0,0 +1,60 @@
+import pytest
+
+from benchmarks.report import Direction, Metric, Report, find_regressions, percentile
+
+
+def make_report(rps: float, p99: float) -> Report:
+    return Report(
+        name="load",
+        results={
+            "/": {
+                "rps": Metric(value=rps, unit="req/s", direction=Direction.HIGHER_IS_BETTER),
+                "p99": Metric(value=p99, unit="ms", direction=Direction.LOWER_IS_BETTER),
+            }
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "pct,expected",
+    [
+        (50, 5.0),
+        (95, 10.0),
+        (99, 10.0),
+        (0, 1.0),
+    ],
+)
+def test_percentile(pct: float, expected: float) -> None:
+    assert percentile([10.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0], pct) == expected
+
+
+def test_no_regressions_within_tolerance() -> None:
+    assert find_regressions(make_report(1000, 10), make_report(950, 10.5), tolerance_pct=10) == []
+
+
+def test_throughput_drop_is_a_regression() -> None:
+    regressions = find_regressions(make_report(1000, 10), make_report(800, 10), tolerance_pct=10)
+    assert [(r.scenario, r.metric) for r in regressions] == [("/", "rps")]
+    assert regressions[0].change_pct == pytest.approx(-20)
+
+
+def test_latency_increase_is_a_regression() -> None:
+    regressions = find_regressions(make_report(1000, 10), make_report(1000, 12), tolerance_pct=10)
+    assert [(r.scenario, r.metric) for r in regressions] == [("/", "p99")]
+
+
+def test_increase_from_zero_is_a_regression() -> None:
+    baseline = make_report(1000, 10)
+    baseline.results["/"]["error_rate"] = Metric(value=0.0, unit="%", direction=Direction.LOWER_IS_BETTER)
+    current = make_report(1000, 10)
+    current.results["/"]["error_rate"] = Metric(value=100.0, unit="%", direction=Direction.LOWER_IS_BETTER)
+    regressions = find_regressions(baseline, current, tolerance_pct=10)
+    assert [(r.scenario, r.metric) for r in regressions] == [("/", "error_rate")]
+    assert str(regressions[0]) == "/ error_rate: 0.000 -> 100.000 (+inf%)"
+    assert find_regressions(baseline, baseline, tolerance_pct=10) == []
+
+
+def test_report_roundtrip(tmp_path) -> None:
+    report = make_report(1000, 10)
+    report.save(tmp_path / "report.json")
+    assert Report.load(tmp_path / "report.json") == report
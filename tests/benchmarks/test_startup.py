@@ -0,0 +1,36 @@
+import pytest
+
+from benchmarks.startup import digest, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   encodings.aliases
+import time:       200 |        300 | site
+import time:        50 |         50 |     fastapi.params
+import time:       150 |        200 |   fastapi
+import time:       400 |        400 |   aiohttp
+import time:        25 |        625 | python_service_template.app
+"""
+
+
+def test_parse_importtime_only_keeps_target_import() -> None:
+    records = parse_importtime(IMPORTTIME_OUTPUT, "python_service_template.app")
+    assert [record.module for record in records] == [
+        "fastapi.params",
+        "fastapi",
+        "aiohttp",
+        "python_service_template.app",
+    ]
+    assert [record.depth for record in records] == [2, 1, 1, 0]
+    assert records[-1].cumulative_us == 625
+
+
+def test_parse_importtime_missing_target() -> None:
+    with pytest.raises(ValueError):
+        parse_importtime(IMPORTTIME_OUTPUT, "missing")
+
+
+def test_digest_groups_by_package() -> None:
+    breakdown = digest(parse_importtime(IMPORTTIME_OUTPUT, "python_service_template.app"), top=2)
+    assert breakdown["import_by_package_ms"] == {"aiohttp": 0.4, "fastapi": 0.2}
+    assert list(breakdown["import_slowest_modules_ms"]) == ["aiohttp", "fastapi"]
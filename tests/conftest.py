@@ -0,0 +1,56 @@
+import typing as t
+
+import pytest
+
+from python_service_template.domain.coffee.catalog import CoffeeCatalog, DrinksLookup
+from python_service_template.domain.coffee.entity import CoffeeCategory, CoffeeDrink
+from python_service_template.domain.coffee.service import CoffeeService
+
+
+class StubCoffeeService(CoffeeService):
+    """In-memory service over ``current``; assign another catalog to simulate upstream changes and set ``error`` to
+    make every call fail."""
+
+    def __init__(self, catalog: CoffeeCatalog) -> None:
+        self.current = catalog
+        self.error: Exception | None = None
+
+    async def recommend(self) -> CoffeeDrink | None:
+        catalog = await self.catalog()
+        return catalog.recommendation
+
+    async def get_drinks(self, ids: t.Sequence[int]) -> DrinksLookup:
+        catalog = await self.catalog()
+        return catalog.lookup(ids)
+
+    async def export(self, categories: t.Collection[CoffeeCategory]) -> t.AsyncIterator[CoffeeDrink]:
+        catalog = await self.catalog()
+        drinks = {CoffeeCategory.HOT: catalog.hot, CoffeeCategory.ICED: catalog.iced}
+        return _iterate([drink for category in CoffeeCategory if category in categories for drink in drinks[category]])
+
+    async def catalog(self) -> CoffeeCatalog:
+        if self.error is not None:
+            raise self.error
+        return self.current
+
+
+async def _iterate(drinks: list[CoffeeDrink]) -> t.AsyncIterator[CoffeeDrink]:
+    for drink in drinks:
+        yield drink
+
+
+@pytest.fixture
+def coffee_catalog() -> CoffeeCatalog:
+    """Two hot drinks and an iced drink that shares its id with the espresso, as upstream ids are per category."""
+    return CoffeeCatalog(
+        hot=[
+            CoffeeDrink(id=1, title="Espresso", description="Test", image=None, ingredients=["coffee"]),
+            CoffeeDrink(id=2, title="Latte", description="Test", image=None, ingredients=["coffee", "milk"]),
+        ],
+        iced=[CoffeeDrink(id=1, title="Iced Coffee", description="Test", image=None, ingredients=["coffee", "ice"])],
+    )
+
+
+@pytest.fixture
+def stub_coffee_service(coffee_catalog: CoffeeCatalog) -> StubCoffeeService:
+    return StubCoffeeService(coffee_catalog)
@@ -0,0 +1,48 @@
+from python_service_template.domain.coffee.catalog import CoffeeCatalog
+from python_service_template.domain.coffee.entity import CoffeeCategory, CoffeeDrink
+
+
+def drink(drink_id: int, title: str) -> CoffeeDrink:
+    return CoffeeDrink(id=drink_id, title=title, description="Test", image=None, ingredients=["coffee"])
+
+
+def test_lookup_preserves_order_and_reports_missing_ids():
+    catalog = CoffeeCatalog(hot=[drink(1, "Espresso"), drink(2, "Latte")], iced=[])
+    result = catalog.lookup([2, 3, 1, 2])
+    assert [d.drink.title for d in result.drinks] == ["Latte", "Espresso"]
+    assert result.not_found == [3]
+
+
+def test_lookup_returns_all_drinks_sharing_an_id():
+    catalog = CoffeeCatalog(hot=[drink(1, "Espresso")], iced=[drink(1, "Iced Coffee")])
+    result = catalog.lookup([1])
+    assert [(d.category, d.drink.title) for d in result.drinks] == [
+        (CoffeeCategory.HOT, "Espresso"),
+        (CoffeeCategory.ICED, "Iced Coffee"),
+    ]
+
+
+def test_version_changes_with_content():
+    first = CoffeeCatalog(hot=[drink(1, "Espresso")], iced=[])
+    same = CoffeeCatalog(hot=[drink(1, "Espresso")], iced=[])
+    other = CoffeeCatalog(hot=[drink(1, "Ristretto")], iced=[])
+    assert first.version == same.version
+    assert first.version != other.version
+
+
+def test_version_changes_when_a_drink_moves_between_categories():
+    espresso, latte = drink(1, "Espresso"), drink(2, "Latte")
+    assert CoffeeCatalog(hot=[espresso], iced=[latte]).version != CoffeeCatalog(hot=[espresso, latte], iced=[]).version
+
+
+def test_recommendation_is_the_first_hot_espresso():
+    assert CoffeeCatalog(hot=[drink(2, "Latte"), drink(1, "Espresso")], iced=[]).recommendation == drink(1, "Espresso")
+    assert CoffeeCatalog(hot=[drink(2, "Latte")], iced=[drink(1, "Espresso")]).recommendation is None
+
+
+def test_diff_groups_ids_per_category():
+    previous = CoffeeCatalog(hot=[drink(1, "Espresso"), drink(2, "Latte")], iced=[])
+    current = CoffeeCatalog(hot=[drink(2, "Latte")], iced=[drink(1, "Iced Coffee")])
+    added, removed = current.diff(previous)
+    assert added == {CoffeeCategory.HOT: [], CoffeeCategory.ICED: [1]}
+    assert removed == {CoffeeCategory.HOT: [1], CoffeeCategory.ICED: []}
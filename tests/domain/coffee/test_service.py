@@ -2,8 +2,8 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from python_service_template.domain.coffee.entity import CoffeeDrink
-from python_service_template.domain.coffee.repository import CoffeeClient
+from python_service_template.domain.coffee.entity import CoffeeCategory, CoffeeDrink
+from python_service_template.domain.coffee.repository import CoffeeClient, CoffeeClientError
 from python_service_template.domain.coffee.service import SimpleCoffeeService
 
 
@@ -40,3 +40,70 @@ async def test_recommend_returns_none_if_no_espresso():
     service = SimpleCoffeeService(mock_client)
     result = await service.recommend()
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_get_drinks_serves_cached_catalog():
+    mock_client = MagicMock(spec=CoffeeClient)
+    hot = [CoffeeDrink(id=1, title="Espresso", description="Test", image=None, ingredients=["coffee"])]
+    mock_client.get_hot = AsyncMock(return_value=hot)
+    mock_client.get_iced = AsyncMock(return_value=[])
+    service = SimpleCoffeeService(mock_client, catalog_max_age=60)
+
+    first = await service.get_drinks([1, 2])
+    second = await service.get_drinks([1])
+
+    assert [d.drink for d in first.drinks] == hot
+    assert first.not_found == [2]
+    assert [d.drink for d in second.drinks] == hot
+    mock_client.get_hot.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_catalog_index_is_reused_for_unchanged_data():
+    mock_client = MagicMock(spec=CoffeeClient)
+    hot: list[CoffeeDrink] = []
+    iced: list[CoffeeDrink] = []
+    mock_client.get_hot = AsyncMock(return_value=hot)
+    mock_client.get_iced = AsyncMock(return_value=iced)
+    service = SimpleCoffeeService(mock_client)
+
+    first = await service.catalog()
+    second = await service.catalog()
+
+    assert mock_client.get_hot.await_count == 2
+    assert second is first
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("categories", "titles"),
+    [
+        ([CoffeeCategory.HOT, CoffeeCategory.ICED], ["Espresso", "Iced Coffee"]),
+        ([CoffeeCategory.ICED], ["Iced Coffee"]),
+    ],
+)
+async def test_export_yields_drinks_of_categories(categories, titles):
+    mock_client = MagicMock(spec=CoffeeClient)
+    hot = [CoffeeDrink(id=1, title="Espresso", description="Test", image=None, ingredients=["coffee"])]
+    iced = [CoffeeDrink(id=1, title="Iced Coffee", description="Test", image=None, ingredients=["coffee"])]
+    mock_client.get_hot = AsyncMock(return_value=hot)
+    mock_client.get_iced = AsyncMock(return_value=iced)
+    service = SimpleCoffeeService(mock_client, catalog_max_age=60)
+
+    for _ in range(2):
+        drinks = await service.export(categories)
+        assert [drink.title async for drink in drinks] == titles
+    # Both exports are served from the cached catalog
+    mock_client.get_hot.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_export_raises_before_iterating():
+    mock_client = MagicMock(spec=CoffeeClient)
+    mock_client.get_hot = AsyncMock(side_effect=CoffeeClientError("Error fetching data: 500"))
+    mock_client.get_iced = AsyncMock(return_value=[])
+    service = SimpleCoffeeService(mock_client)
+
+    with pytest.raises(CoffeeClientError):
+        await service.export(list(CoffeeCategory))
@@ -1,8 +1,11 @@
+import aiohttp
 import pytest
 from aiohttp import web
 
 from python_service_template.domain.coffee.repository import CoffeeClientError
+from python_service_template.domain.coffee.service import SimpleCoffeeService
 from python_service_template.infrastructure.client.coffee import AsyncCoffeeClient
+from python_service_template.tracing import Tracer
 
 
 @pytest.fixture
@@ -165,3 +168,115 @@ async def test_get_all_one_fails(aiohttp_client):
     coffee_client = AsyncCoffeeClient(base_url=str(client.make_url("")))
     with pytest.raises(CoffeeClientError):
         await coffee_client.get_all()
+
+
+@pytest.mark.asyncio
+async def test_shared_session_is_reused(aiohttp_client, coffee_app, coffee_data):
+    client = await aiohttp_client(coffee_app)
+    async with aiohttp.ClientSession() as session:
+        coffee_client = AsyncCoffeeClient(base_url=str(client.make_url("")), session=session)
+        assert len(await coffee_client.get_hot()) == len(coffee_data)
+        assert len(await coffee_client.get_iced()) == len(coffee_data)
+        assert not session.closed
+
+
+@pytest.mark.asyncio
+async def test_get_hot_revalidates_with_etag(aiohttp_client, coffee_data):
+    requests = []
+
+    async def hot_handler(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.json_response(coffee_data, headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/hot", hot_handler)
+    client = await aiohttp_client(app)
+    coffee_client = AsyncCoffeeClient(base_url=str(client.make_url("")))
+    first = await coffee_client.get_hot()
+    second = await coffee_client.get_hot()
+    assert requests == [None, '"v1"']
+    assert second is first
+
+
+@pytest.mark.asyncio
+async def test_get_hot_revalidates_with_last_modified(aiohttp_client, coffee_data):
+    last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+    requests = []
+
+    async def hot_handler(request):
+        requests.append(request.headers.get("If-Modified-Since"))
+        if request.headers.get("If-Modified-Since") == last_modified:
+            return web.Response(status=304)
+        return web.json_response(coffee_data, headers={"Last-Modified": last_modified})
+
+    app = web.Application()
+    app.router.add_get("/hot", hot_handler)
+    client = await aiohttp_client(app)
+    coffee_client = AsyncCoffeeClient(base_url=str(client.make_url("")))
+    first = await coffee_client.get_hot()
+    second = await coffee_client.get_hot()
+    assert requests == [None, last_modified]
+    assert second is first
+
+
+@pytest.mark.asyncio
+async def test_get_hot_without_validators_uses_content_hash(aiohttp_client, coffee_data):
+    payload = list(coffee_data)
+
+    async def hot_handler(request):
+        assert "If-None-Match" not in request.headers
+        assert "If-Modified-Since" not in request.headers
+        return web.json_response(payload)
+
+    app = web.Application()
+    app.router.add_get("/hot", hot_handler)
+    client = await aiohttp_client(app)
+    coffee_client = AsyncCoffeeClient(base_url=str(client.make_url("")))
+    first = await coffee_client.get_hot()
+    # Same body: the previous result is reused without validating it again
+    assert await coffee_client.get_hot() is first
+    # Changed body: validated again
+    payload.pop()
+    changed = await coffee_client.get_hot()
+    assert changed is not first
+    assert len(changed) == len(coffee_data) - 1
+
+
+@pytest.mark.asyncio
+async def test_get_hot_invalid_json(aiohttp_client):
+    async def hot_handler(request):
+        return web.Response(body=b"not json", content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/hot", hot_handler)
+    client = await aiohttp_client(app)
+    coffee_client = AsyncCoffeeClient(base_url=str(client.make_url("")))
+    with pytest.raises(CoffeeClientError):
+        await coffee_client.get_hot()
+
+
+@pytest.mark.asyncio
+async def test_recommend_is_traced(aiohttp_client, coffee_app):
+    client = await aiohttp_client(coffee_app)
+    service = SimpleCoffeeService(AsyncCoffeeClient(base_url=str(client.make_url(""))))
+    tracer = Tracer(sample_rate=1.0)
+    trace = tracer.start("GET /api/v1/coffee/recommend", "cid")
+    assert trace is not None
+    await service.recommend()
+    await tracer.finish(trace)
+
+    spans = {span.name: span for span in trace.spans}
+    assert list(spans) == [
+        "GET /api/v1/coffee/recommend",
+        "SimpleCoffeeService.recommend",
+        "AsyncCoffeeClient.get_hot",
+        "http.request",
+        "CoffeeDrinksDTO.model_validate_json",
+        "CoffeeDrinkDTO.to_domain",
+    ]
+    assert spans["SimpleCoffeeService.recommend"].attributes == {"found": True}
+    assert spans["http.request"].attributes["http.status_code"] == 200
+    assert spans["http.request"].parent_id == spans["AsyncCoffeeClient.get_hot"].span_id
+    assert spans["CoffeeDrinkDTO.to_domain"].attributes == {"count": 2}
@@ -0,0 +1,37 @@
+import pytest
+
+from python_service_template.infrastructure.broadcast import Broadcaster
+
+
+@pytest.mark.asyncio
+async def test_publish_fans_out_to_all_subscribers():
+    broadcaster = Broadcaster[int]()
+    with broadcaster.subscribe() as first, broadcaster.subscribe() as second:
+        broadcaster.publish(1)
+        assert await first.get() == 1
+        assert await second.get() == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_items():
+    broadcaster = Broadcaster[int](buffer_size=2)
+    with broadcaster.subscribe() as subscription:
+        for item in range(5):
+            broadcaster.publish(item)
+        assert [await subscription.get(), await subscription.get()] == [3, 4]
+        assert subscription.dropped == 3
+
+
+@pytest.mark.asyncio
+async def test_get_returns_none_on_timeout():
+    broadcaster = Broadcaster[int]()
+    with broadcaster.subscribe() as subscription:
+        assert await subscription.get(timeout=0.01) is None
+
+
+def test_subscription_is_removed_on_exit():
+    broadcaster = Broadcaster[int]()
+    with broadcaster.subscribe():
+        assert len(broadcaster) == 1
+    assert len(broadcaster) == 0
+    broadcaster.publish(1)
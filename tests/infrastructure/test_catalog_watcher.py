@@ -0,0 +1,124 @@
+import asyncio
+import typing as t
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from python_service_template.domain.coffee.catalog import CatalogChange, CoffeeCatalog
+from python_service_template.domain.coffee.entity import CoffeeCategory, CoffeeDrink
+from python_service_template.domain.coffee.service import CoffeeService
+from python_service_template.infrastructure.broadcast import Broadcaster
+from python_service_template.infrastructure.catalog_watcher import CatalogWatcher
+
+ESPRESSO = CoffeeDrink(id=1, title="Espresso", description="Test", image=None, ingredients=["coffee"])
+LATTE = CoffeeDrink(id=2, title="Latte", description="Test", image=None, ingredients=["coffee", "milk"])
+
+
+@pytest.mark.asyncio
+async def test_first_check_publishes_the_whole_catalog(stub_coffee_service):
+    broadcaster = Broadcaster[CatalogChange]()
+    stub_coffee_service.current = CoffeeCatalog(hot=[ESPRESSO], iced=[])
+    watcher = CatalogWatcher(stub_coffee_service, broadcaster, interval=60)
+    with broadcaster.subscribe() as subscription:
+        change = await watcher.check()
+        assert change is not None
+        assert await subscription.get() == change
+    assert change.recommendation == ESPRESSO
+    assert change.recommendation_changed
+    assert change.added == {CoffeeCategory.HOT: [1], CoffeeCategory.ICED: []}
+    assert watcher.latest == change
+
+
+@pytest.mark.asyncio
+async def test_recommendation_comes_from_the_checked_catalog():
+    service = MagicMock(spec=CoffeeService)
+    service.catalog = AsyncMock(return_value=CoffeeCatalog(hot=[LATTE, ESPRESSO], iced=[]))
+    watcher = CatalogWatcher(service, Broadcaster[CatalogChange](), interval=60)
+    change = await watcher.check()
+    assert change is not None
+    assert change.recommendation == ESPRESSO
+    service.recommend.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_catalog_publishes_nothing(stub_coffee_service):
+    broadcaster = Broadcaster[CatalogChange]()
+    service = stub_coffee_service
+    service.current = CoffeeCatalog(hot=[ESPRESSO], iced=[])
+    watcher = CatalogWatcher(service, broadcaster, interval=60)
+    await watcher.check()
+    service.current = CoffeeCatalog(hot=[ESPRESSO], iced=[])
+    assert await watcher.check() is None
+
+
+@pytest.mark.asyncio
+async def test_change_contains_diff_and_recommendation(stub_coffee_service):
+    broadcaster = Broadcaster[CatalogChange]()
+    service = stub_coffee_service
+    service.current = CoffeeCatalog(hot=[ESPRESSO], iced=[])
+    watcher = CatalogWatcher(service, broadcaster, interval=60)
+    first = await watcher.check()
+    service.current = CoffeeCatalog(hot=[LATTE], iced=[ESPRESSO])
+
+    change = await watcher.check()
+
+    assert change is not None
+    assert change.version != t.cast(CatalogChange, first).version
+    assert change.recommendation is None
+    assert change.recommendation_changed
+    assert change.added == {CoffeeCategory.HOT: [2], CoffeeCategory.ICED: [1]}
+    assert change.removed == {CoffeeCategory.HOT: [1], CoffeeCategory.ICED: []}
+
+
+@pytest.mark.asyncio
+async def test_running_refreshes_only_with_subscribers(stub_coffee_service):
+    service = stub_coffee_service
+    service.current = CoffeeCatalog(hot=[ESPRESSO], iced=[])
+    watcher = CatalogWatcher(service, Broadcaster[CatalogChange](), interval=0.01)
+    async with watcher.running():
+        await asyncio.sleep(0.05)
+        assert watcher.latest is None
+        with watcher.broadcaster.subscribe() as subscription:
+            change = await subscription.get(timeout=1)
+    assert change is not None
+    assert watcher.latest == change
+
+
+@pytest.mark.asyncio
+async def test_ensure_latest_checks_only_once(stub_coffee_service):
+    watcher = CatalogWatcher(stub_coffee_service, Broadcaster[CatalogChange](), interval=60)
+    first = await watcher.ensure_latest()
+    assert first is not None
+    stub_coffee_service.current = CoffeeCatalog(hot=[LATTE], iced=[])
+    assert await watcher.ensure_latest() is first
+
+
+@pytest.mark.asyncio
+async def test_ensure_latest_rechecks_an_outdated_change(stub_coffee_service):
+    watcher = CatalogWatcher(stub_coffee_service, Broadcaster[CatalogChange](), interval=0.01)
+    first = await watcher.ensure_latest()
+    assert first is not None
+    # Nobody was subscribed for longer than the interval, so the periodic loop did not refresh
+    stub_coffee_service.current = CoffeeCatalog(hot=[LATTE], iced=[])
+    await asyncio.sleep(0.02)
+    latest = await watcher.ensure_latest()
+    assert latest is not None
+    assert latest.version == stub_coffee_service.current.version
+
+
+@pytest.mark.asyncio
+async def test_ensure_latest_logs_failures(stub_coffee_service):
+    stub_coffee_service.error = RuntimeError("upstream down")
+    watcher = CatalogWatcher(stub_coffee_service, Broadcaster[CatalogChange](), interval=60)
+    assert await watcher.ensure_latest() is None
+
+
+@pytest.mark.asyncio
+async def test_running_survives_errors(stub_coffee_service):
+    stub_coffee_service.error = RuntimeError("upstream down")
+    watcher = CatalogWatcher(stub_coffee_service, Broadcaster[CatalogChange](), interval=0.01)
+    async with watcher.running():
+        with watcher.broadcaster.subscribe():
+            # Several refresh rounds fail, the loop keeps running until the context exits
+            await asyncio.sleep(0.05)
+    assert watcher.latest is None
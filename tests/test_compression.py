@@ -0,0 +1,162 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from python_service_template.compression import (
+    CompressionMiddleware,
+    Encoder,
+    GzipEncoder,
+    PrecompressedCache,
+    StreamCompressor,
+    etag_matches,
+    negotiate,
+)
+
+LARGE = [{"id": idx, "title": f"Drink {idx}"} for idx in range(100)]
+
+
+class CountingEncoder(Encoder):
+    name = "gzip"
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.encoder = GzipEncoder()
+
+    def compress(self, data: bytes) -> bytes:
+        self.calls += 1
+        return self.encoder.compress(data)
+
+    def stream(self) -> StreamCompressor:
+        return self.encoder.stream()
+
+
+@pytest.fixture
+def encoder():
+    return CountingEncoder()
+
+
+@pytest.fixture
+def client(encoder):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, encoders={"gzip": GzipEncoder()})
+    cache = PrecompressedCache(max_entries=2, minimum_size=500, encoders={"gzip": encoder})
+
+    @app.get("/large")
+    async def large():
+        return LARGE
+
+    @app.get("/small")
+    async def small():
+        return {"id": 1}
+
+    @app.get("/binary")
+    async def binary():
+        return Response(b"\0" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for drink in LARGE:
+                yield json.dumps(drink) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/cached")
+    async def cached(request: Request):
+        return cache.response(request, json.dumps(LARGE).encode())
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("gzip, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "zstd"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate(accept_encoding: str, expected: str | None) -> None:
+    assert negotiate(accept_encoding, ["zstd", "br", "gzip"]) == expected
+
+
+def test_large_response_is_compressed(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == LARGE
+
+
+def test_without_accept_encoding_nothing_is_compressed(client):
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == LARGE
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_binary_response_is_not_compressed(client):
+    response = client.get("/binary", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_streamed_response_is_compressed(client):
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert [json.loads(line) for line in lines] == LARGE
+
+
+def test_precompressed_response_is_compressed_once(client, encoder):
+    for _ in range(3):
+        response = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == LARGE
+    assert encoder.calls == 1
+
+
+def test_precompressed_response_revalidation(client):
+    etag = client.get("/cached", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    response = client.get("/cached", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    # Without the weak prefix, as sent by some clients and CDNs
+    response = client.get("/cached", headers={"If-None-Match": etag.removeprefix("W/")})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "matches"),
+    [
+        ('W/"v1"', True),
+        ('"v1"', True),
+        ('"v0", W/"v1"', True),
+        ("*", True),
+        ('W/"v2"', False),
+        ("v1", False),
+        ("", False),
+    ],
+)
+def test_etag_matches_uses_weak_comparison(if_none_match, matches):
+    assert etag_matches(if_none_match, "v1") is matches
+
+
+def test_precompressed_cache_is_bounded(encoder):
+    cache = PrecompressedCache(max_entries=2, encoders={"gzip": encoder})
+    for version in ("a", "b", "c", "a"):
+        cache.get(version, "gzip", b"payload")
+    # "a" was evicted by "c" and had to be compressed again
+    assert encoder.calls == 4
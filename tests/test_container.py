@@ -0,0 +1,34 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from python_service_template.app import app
+from python_service_template.dependencies import coffee_service
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+def test_container_is_created_once_per_app(client):
+    container = app.state.container
+    assert container.coffee_service.client is container.coffee_client
+    assert container.coffee_client.session is container.session
+    assert container.detailed_health_checker.coffee_client is container.coffee_client
+    assert container.simple_health_checker.coffee_client is container.coffee_client
+
+
+def test_dependencies_can_be_overridden(client, stub_coffee_service):
+    app.dependency_overrides[coffee_service] = lambda: stub_coffee_service
+    response = client.get("/api/v1/coffee/recommend")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Espresso"
+
+
+def test_session_is_closed_on_shutdown():
+    with TestClient(app):
+        session = app.state.container.session
+        assert not session.closed
+    assert session.closed
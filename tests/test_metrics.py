@@ -0,0 +1,66 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, Counter
+
+from python_service_template.__main__ import prepare_metrics_dir
+from python_service_template.app import app
+from python_service_template.metrics import MetricsExporter, cleanup_dead_workers
+
+# Far above the default pid_max, so no process can have it
+DEAD_PID = 2**30
+
+
+@pytest.mark.asyncio
+async def test_render_is_cached_for_ttl():
+    registry = CollectorRegistry()
+    counter = Counter("scrapes", "Test counter", registry=registry)
+    exporter = MetricsExporter(registry, ttl=60)
+
+    first = await exporter.render()
+    counter.inc()
+
+    assert await exporter.render() is first
+    exporter.ttl = 0
+    assert await exporter.render() != first
+
+
+def test_cleanup_dead_workers_removes_live_gauges_only(tmp_path):
+    alive = tmp_path / f"gauge_livesum_{os.getpid()}.db"
+    dead_gauge = tmp_path / f"gauge_liveall_{DEAD_PID}.db"
+    dead_counter = tmp_path / f"counter_{DEAD_PID}.db"
+    for file in (alive, dead_gauge, dead_counter):
+        file.touch()
+
+    assert cleanup_dead_workers(tmp_path) == [DEAD_PID]
+    assert alive.exists()
+    assert not dead_gauge.exists()
+    assert dead_counter.exists()
+
+
+def test_prepare_metrics_dir_creates_temporary_dir_for_several_workers(monkeypatch):
+    # Registers the variable with monkeypatch, so the value set by prepare_metrics_dir is undone afterwards
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "")
+    assert prepare_metrics_dir(workers=1) is None
+    assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == ""
+
+    path = prepare_metrics_dir(workers=2)
+    assert path is not None
+    assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == str(path)
+    path.rmdir()
+
+
+def test_prepare_metrics_dir_wipes_configured_dir(monkeypatch, tmp_path):
+    (tmp_path / "counter_1.db").touch()
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    assert prepare_metrics_dir(workers=2) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_metrics_endpoint():
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "http_requests_total" in response.text
@@ -0,0 +1,98 @@
+import pytest
+from asgi_correlation_id import correlation_id
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from python_service_template.middleware import (
+    RequestContextMiddleware,
+    SequentialId,
+    create_id_generator,
+    random_id,
+)
+from python_service_template.settings import IdGenerator
+
+ORIGIN = "http://localhost:3000"
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(
+        RequestContextMiddleware,
+        generator=lambda: "generated",
+        allow_origins=[ORIGIN],
+        allow_credentials=True,
+        expose_headers=["X-Request-ID"],
+    )
+
+    @app.api_route("/", methods=["GET", "OPTIONS"])
+    async def index(request: Request) -> dict[str, str | None]:
+        return {"header": request.headers.get("x-request-id"), "context": correlation_id.get()}
+
+    return TestClient(app)
+
+
+def test_generates_request_id(client):
+    response = client.get("/")
+    assert response.json() == {"header": "generated", "context": "generated"}
+    assert response.headers["x-request-id"] == "generated"
+    assert response.headers["server-timing"].startswith("app;dur=")
+
+
+def test_keeps_incoming_request_id(client):
+    response = client.get("/", headers={"X-Request-ID": "incoming"})
+    assert response.json() == {"header": "incoming", "context": "incoming"}
+    assert response.headers["x-request-id"] == "incoming"
+
+
+def test_simple_request_from_allowed_origin(client):
+    response = client.get("/", headers={"Origin": ORIGIN})
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-expose-headers"] == "X-Request-ID"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_simple_request_from_other_origin(client):
+    response = client.get("/", headers={"Origin": "http://example.com"})
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_preflight_is_answered_without_the_app(client):
+    response = client.options(
+        "/",
+        headers={
+            "Origin": ORIGIN,
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type",
+        },
+    )
+    assert response.status_code == 200
+    assert response.text == "OK"
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert response.headers["access-control-allow-headers"] == "content-type"
+    assert "POST" in response.headers["access-control-allow-methods"]
+    assert response.headers["x-request-id"] == "generated"
+
+
+def test_preflight_from_other_origin_is_rejected(client):
+    response = client.options("/", headers={"Origin": "http://example.com", "Access-Control-Request-Method": "GET"})
+    assert response.status_code == 400
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_options_without_preflight_headers_reaches_the_app(client):
+    assert client.options("/", headers={"Origin": ORIGIN}).json()["header"] == "generated"
+
+
+@pytest.mark.parametrize("generator", [random_id, SequentialId()])
+def test_generators_produce_unique_hex_ids(generator):
+    ids = {generator() for _ in range(1000)}
+    assert len(ids) == 1000
+    assert all(len(value) == 32 and int(value, 16) >= 0 for value in ids)
+
+
+@pytest.mark.parametrize("kind", list(IdGenerator))
+def test_create_id_generator(kind):
+    assert len(create_id_generator(kind)()) == 32
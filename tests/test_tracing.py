@@ -0,0 +1,216 @@
+import asyncio
+import json
+import typing as t
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from python_service_template.api.admin import router as admin_router
+from python_service_template.dependencies import tracer as tracer_dependency
+from python_service_template.middleware import RequestContextMiddleware
+from python_service_template.settings import TracingConfig
+from python_service_template.tracing import OtlpJsonFileExporter, Tracer, span, trace_id_for
+
+
+async def test_span_is_noop_without_trace():
+    with span("outside") as current:
+        current.set_attribute("ignored", True)
+    assert not hasattr(current, "attributes")
+
+
+async def test_unsampled_request_starts_no_trace():
+    assert Tracer(sample_rate=0.0).start("GET /", "cid") is None
+
+
+async def test_spans_are_nested_under_the_current_span():
+    tracer = Tracer(sample_rate=1.0, slow_threshold_ms=0.0)
+    trace = tracer.start("GET /", "cid")
+    assert trace is not None
+    with span("outer", step=1) as outer:
+        with span("inner") as inner:
+            pass
+    with span("sibling") as sibling:
+        pass
+    await tracer.finish(trace)
+
+    assert [s.name for s in trace.spans] == ["GET /", "outer", "inner", "sibling"]
+    assert outer.parent_id == trace.root.span_id
+    assert inner.parent_id == outer.span_id
+    assert sibling.parent_id == trace.root.span_id
+    assert outer.attributes == {"step": 1}
+    assert all(s.end_ns >= s.start_ns for s in trace.spans)
+    # The trace is no longer current once it is finished
+    with span("after") as after:
+        pass
+    assert after not in trace.spans
+
+
+async def test_span_records_errors():
+    tracer = Tracer(sample_rate=1.0)
+    trace = tracer.start("GET /", "cid")
+    assert trace is not None
+    with pytest.raises(ValueError), span("failing"):
+        raise ValueError("boom")
+    await tracer.finish(trace)
+    assert trace.spans[1].attributes == {"error": "ValueError"}
+
+
+async def test_only_slow_traces_are_kept():
+    tracer = Tracer(sample_rate=1.0, slow_threshold_ms=60_000.0, buffer_size=2)
+    trace = tracer.start("GET /fast", "fast")
+    assert trace is not None
+    await tracer.finish(trace)
+    assert not tracer.slow_traces
+
+    tracer.slow_threshold_ms = 0.0
+    for cid in ("a", "b", "c"):
+        trace = tracer.start("GET /slow", cid)
+        assert trace is not None
+        await tracer.finish(trace)
+    assert [trace.correlation_id for trace in tracer.slow_traces] == ["b", "c"]
+
+
+def test_trace_id_for():
+    assert trace_id_for("0123456789abcdef0123456789abcdef") == "0123456789abcdef0123456789abcdef"
+    derived = trace_id_for("my-request")
+    assert len(derived) == 32
+    assert derived == trace_id_for("my-request")
+
+
+async def test_configure(tmp_path):
+    tracer = Tracer()
+    tracer.configure(
+        TracingConfig(sample_rate=0.5, slow_threshold_ms=10.0, buffer_size=5, export_path=tmp_path / "traces.jsonl"),
+        "service",
+        "1.0.0",
+    )
+    assert tracer.sample_rate == 0.5
+    assert tracer.slow_threshold_ms == 10.0
+    assert tracer.slow_traces.maxlen == 5
+    assert tracer.exporter is not None
+    assert tracer.exporter.path == tmp_path / "traces.jsonl"
+
+
+async def test_otlp_export(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(sample_rate=1.0, exporter=OtlpJsonFileExporter(path, "service", "1.0.0"))
+    for _ in range(2):
+        trace = tracer.start("GET /", "0123456789abcdef0123456789abcdef", **{"http.method": "GET"})
+        assert trace is not None
+        with span("child", count=3, ratio=0.5, cached=False):
+            pass
+        await tracer.finish(trace)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    resource_spans = json.loads(lines[0])["resourceSpans"][0]
+    assert {"key": "service.name", "value": {"stringValue": "service"}} in resource_spans["resource"]["attributes"]
+    root, child = resource_spans["scopeSpans"][0]["spans"]
+    assert root["traceId"] == child["traceId"] == "0123456789abcdef0123456789abcdef"
+    assert "parentSpanId" not in root
+    assert child["parentSpanId"] == root["spanId"]
+    assert root["kind"] == 2
+    assert {"key": "correlation_id", "value": {"stringValue": "0123456789abcdef0123456789abcdef"}} in root["attributes"]
+    assert child["attributes"] == [
+        {"key": "count", "value": {"intValue": "3"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "cached", "value": {"boolValue": False}},
+    ]
+    assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+
+
+async def test_failed_export_is_logged(tmp_path):
+    tracer = Tracer(sample_rate=1.0, exporter=OtlpJsonFileExporter(tmp_path / "missing" / "t.jsonl", "s", "1"))
+    trace = tracer.start("GET /", "cid")
+    assert trace is not None
+    await tracer.finish(trace)
+    assert not (tmp_path / "missing").exists()
+
+
+@pytest.fixture
+def traced_app():
+    tracer = Tracer(sample_rate=1.0, slow_threshold_ms=0.0)
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, generator=lambda: "generated", tracer=tracer)
+    app.include_router(admin_router)
+    app.dependency_overrides[tracer_dependency] = lambda: tracer
+
+    @app.get("/work")
+    async def work() -> dict[str, bool]:
+        with span("handler"):
+            with span("step", size=1):
+                pass
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> t.AsyncIterator[bytes]:
+            yield b"first\n"
+            await asyncio.sleep(0.2)
+            yield b"second\n"
+
+        return StreamingResponse(chunks())
+
+    @app.get("/fail")
+    async def fail() -> None:
+        with span("handler"):
+            raise HTTPException(status_code=404)
+
+    return app, tracer
+
+
+def test_requests_are_traced_by_the_middleware(traced_app):
+    app, tracer = traced_app
+    client = TestClient(app)
+    client.get("/work", headers={"X-Request-ID": "abc"})
+    client.get("/fail")
+
+    work, fail = tracer.slow_traces
+    assert work.correlation_id == "abc"
+    assert work.trace_id == trace_id_for("abc")
+    assert [s.name for s in work.spans] == ["GET /work", "handler", "step"]
+    assert work.root.attributes == {"http.method": "GET", "http.status_code": 200}
+    assert fail.correlation_id == "generated"
+    assert fail.root.attributes["http.status_code"] == 404
+    assert fail.spans[1].attributes == {"error": "HTTPException"}
+
+
+def test_streamed_body_does_not_make_a_trace_slow(traced_app):
+    app, tracer = traced_app
+    tracer.slow_threshold_ms = 100.0
+    client = TestClient(app)
+    assert client.get("/stream").text == "first\nsecond\n"
+    assert not tracer.slow_traces
+
+    tracer.slow_threshold_ms = 0.0
+    client.get("/stream")
+    [trace] = tracer.slow_traces
+    assert trace.duration_ms >= 200
+    assert trace.response_ms < trace.duration_ms
+
+
+def test_admin_traces(traced_app):
+    app, tracer = traced_app
+    client = TestClient(app)
+    client.get("/work", headers={"X-Request-ID": "first"})
+    client.get("/work", headers={"X-Request-ID": "second"})
+    tracer.sample_rate = 0.0
+
+    response = client.get("/admin/traces", params={"limit": 1})
+    assert response.status_code == 200
+    [trace] = response.json()
+    assert trace["correlationId"] == "second"
+    assert trace["traceId"] == trace_id_for("second")
+    assert trace["name"] == "GET /work"
+    assert trace["durationMs"] >= trace["responseMs"] >= 0
+    root, handler, step = trace["spans"]
+    assert root["parentSpanId"] is None
+    assert handler["parentSpanId"] == root["spanId"]
+    assert step["parentSpanId"] == handler["spanId"]
+    assert step["attributes"] == {"size": 1}
+    assert step["startOffsetMs"] >= handler["startOffsetMs"] >= 0
+
+    assert len(client.get("/admin/traces").json()) == 2
+    assert client.get("/admin/traces", params={"limit": 0}).status_code == 422